@@ -0,0 +1,306 @@
+# Servidor de audio FM: un demodulador, muchos oyentes por red
+# - La cadena FM (fm_demod → resample_poly → de-énfasis) corre UNA sola vez
+# - Cada bloque de 48 kHz se convierte a PCM int16 una vez y se guarda en un anillo
+# - Cada cliente (HTTP WAV o WebSocket) sólo tiene un cursor sobre el anillo:
+#   se le escribe el mismo objeto bytes que a todos, sin copias ni re-codificación
+# - Un cliente lento (se queda atrás del anillo o acumula buffer) se desconecta
+# - WebSocket: se leen los frames del cliente (close → cierre, ping → pong)
+# - Si la fuente falla (p. ej. no hay dongle) el error queda en /stats y se
+#   cierran el anillo y los clientes
+#
+# Uso:
+#   python fm_audio_server.py             → RTL-SDR en 107.1 MHz, puerto 8000
+#   python fm_audio_server.py --tono      → fuente sintética (sin hardware)
+# Oyentes:
+#   http://host:8000/audio.wav   (VLC, navegador)
+#   ws://host:8000/ws            (frames binarios PCM int16 LE, 48 kHz mono)
+#   http://host:8000/stats       (JSON)
+
+import sys
+import json
+import time
+import base64
+import hashlib
+import asyncio
+import threading
+import numpy as np
+import scipy.signal as sig
+
+AUDIO_RATE = 48000
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+
+# ------------------------------------------
+#  CADENA FM (igual que test_audio_fluido_v5)
+# ------------------------------------------
+
+def fm_demod(iq):
+    return np.angle(iq[1:] * np.conj(iq[:-1]))
+
+def deemphasis(audio, fs=48000):
+    tau = 75e-6
+    a = np.exp(-1/(fs*tau))
+    b = [1 - a]
+    a = [1, -a]
+    return sig.lfilter(b, a, audio)
+
+# ------------------------------------------
+#  ANILLO COMPARTIDO
+# ------------------------------------------
+
+def ws_header(n):
+    # frame binario servidor→cliente (sin máscara)
+    if n < 126:
+        return bytes((0x82, n))
+    if n < 65536:
+        return bytes((0x82, 126)) + n.to_bytes(2, "big")
+    return bytes((0x82, 127)) + n.to_bytes(8, "big")
+
+
+def wav_header(rate=AUDIO_RATE):
+    # tamaño "infinito" para streaming
+    return (b"RIFF" + (0xFFFFFFFF).to_bytes(4, "little") + b"WAVEfmt "
+            + (16).to_bytes(4, "little") + (1).to_bytes(2, "little") + (1).to_bytes(2, "little")
+            + rate.to_bytes(4, "little") + (rate * 2).to_bytes(4, "little")
+            + (2).to_bytes(2, "little") + (16).to_bytes(2, "little")
+            + b"data" + (0xFFFFFFFF).to_bytes(4, "little"))
+
+
+class AudioRing:
+    # sólo se modifica desde el hilo del event loop
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.slots = [None] * capacity      # (seq, ws_header, pcm_bytes)
+        self.next_seq = 0
+        self.closed = False
+        self._waiter = None
+
+    def append(self, pcm):
+        self.slots[self.next_seq % self.capacity] = (self.next_seq, ws_header(len(pcm)), pcm)
+        self.next_seq += 1
+        self._wake()
+
+    def close(self):
+        self.closed = True
+        self._wake()
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def get(self, seq):
+        slot = self.slots[seq % self.capacity]
+        if slot is None or slot[0] != seq:
+            return None                      # ya sobrescrito
+        return slot
+
+    async def wait(self, cursor):
+        while self.next_seq <= cursor and not self.closed:
+            if self._waiter is None or self._waiter.done():
+                self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
+
+# ------------------------------------------
+#  SERVIDOR
+# ------------------------------------------
+
+class AudioServer:
+    def __init__(self, host="0.0.0.0", port=8000, ring_blocks=64, max_buffer=256 * 1024):
+        self.host = host
+        self.port = port
+        self.ring = AudioRing(ring_blocks)
+        self.max_buffer = max_buffer         # bytes pendientes por cliente antes de soltarlo
+        self.loop = None
+        self.clients = set()
+        self.stats = {"published": 0, "served": 0, "dropped_slow": 0, "bytes_sent": 0,
+                      "closed_by_client": 0, "pings": 0, "source_error": None}
+        self._t0 = time.time()
+        self._cpu0 = time.process_time()
+
+    # --- llamado desde el hilo del demodulador ---
+    def publish(self, audio):
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        self.loop.call_soon_threadsafe(self._append, pcm)
+
+    def _append(self, pcm):
+        self.ring.append(pcm)
+        self.stats["published"] += 1
+
+    def _source_done(self, error):
+        self.stats["source_error"] = error
+        self.ring.close()
+        for writer in list(self.clients):
+            writer.transport.close()
+
+    # --- clientes ---
+    async def _ws_reader(self, reader, transport):
+        # frames cliente→servidor (siempre enmascarados): close y ping; el resto se ignora
+        try:
+            while not transport.is_closing():
+                b0, b1 = await reader.readexactly(2)
+                opcode, n = b0 & 0x0F, b1 & 0x7F
+                if n == 126:
+                    n = int.from_bytes(await reader.readexactly(2), "big")
+                elif n == 127:
+                    n = int.from_bytes(await reader.readexactly(8), "big")
+                mask = await reader.readexactly(4) if b1 & 0x80 else bytes(4)
+                data = bytes(c ^ mask[i % 4] for i, c in enumerate(await reader.readexactly(n)))
+                if opcode == 0x8:
+                    self.stats["closed_by_client"] += 1
+                    transport.write(bytes((0x88, len(data[:2]))) + data[:2])
+                    transport.close()
+                elif opcode == 0x9:
+                    self.stats["pings"] += 1
+                    transport.write(bytes((0x8A, len(data))) + data)     # control: ≤ 125 bytes
+        except (asyncio.IncompleteReadError, ConnectionError):
+            transport.close()
+
+    async def _pump(self, reader, writer, websocket):
+        transport = writer.transport
+        cursor = self.ring.next_seq          # empezar en el borde en vivo
+        self.clients.add(writer)
+        self.stats["served"] += 1
+        # sin lector el cierre del cliente pasaría inadvertido hasta llenar el buffer
+        ws_reader = asyncio.create_task(self._ws_reader(reader, transport)) if websocket else None
+        try:
+            while not transport.is_closing() and not self.ring.closed:
+                await self.ring.wait(cursor)
+                if transport.is_closing() or self.ring.closed:
+                    return
+                head = self.ring.next_seq
+                if head - cursor >= self.ring.capacity:
+                    self.stats["dropped_slow"] += 1
+                    return
+                for seq in range(cursor, head):
+                    _, hdr, pcm = self.ring.get(seq)
+                    if websocket:
+                        transport.write(hdr)
+                    transport.write(pcm)
+                    self.stats["bytes_sent"] += len(pcm)
+                cursor = head
+                # sin drain(): un cliente lento no bloquea, se mide y se descarta
+                if transport.get_write_buffer_size() > self.max_buffer:
+                    self.stats["dropped_slow"] += 1
+                    return
+        finally:
+            if ws_reader is not None:
+                ws_reader.cancel()
+            self.clients.discard(writer)
+            transport.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+            writer.close()
+            return
+
+        lines = request.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        path = parts[1] if len(parts) > 1 else "/"
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+
+        if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+            key = headers.get("sec-websocket-key", "").encode()
+            accept = base64.b64encode(hashlib.sha1(key + WS_GUID).digest())
+            writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                         b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+            await self._pump(reader, writer, websocket=True)
+        elif path in ("/", "/audio.wav"):
+            writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: audio/wav\r\n"
+                         b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n" + wav_header())
+            await self._pump(reader, writer, websocket=False)
+        elif path == "/stats":
+            body = json.dumps(self.snapshot()).encode()
+            writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+            await writer.drain()
+            writer.close()
+        else:
+            writer.write(b"HTTP/1.0 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            writer.close()
+
+    def snapshot(self):
+        return dict(self.stats,
+                    clients=len(self.clients),
+                    uptime=time.time() - self._t0,
+                    cpu_time=time.process_time() - self._cpu0)
+
+    async def serve(self, ready=None):
+        self.loop = asyncio.get_running_loop()
+        server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+    def _run_source(self, source, ready):
+        ready.wait()
+        error = None
+        try:
+            source(self)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"❌ fuente detenida: {error}")
+        self.loop.call_soon_threadsafe(self._source_done, error)
+
+    def run(self, source):
+        # el demodulador corre en su propio hilo y publica al anillo
+        ready = threading.Event()
+        threading.Thread(target=self._run_source, args=(source, ready), daemon=True).start()
+        asyncio.run(self.serve(ready))
+
+# ------------------------------------------
+#  FUENTES
+# ------------------------------------------
+
+def sdr_source(freq=107.1e6):
+    def run(server):
+        from rtlsdr import RtlSdr
+        sdr = RtlSdr()
+        sdr.sample_rate = 1.024e6
+        sdr.center_freq = freq
+        sdr.gain = 40
+
+        BLOCK = 128 * 1024
+
+        while True:
+            samples = sdr.read_samples(BLOCK)
+            demod = fm_demod(samples)
+            audio = sig.resample_poly(demod, up=3, down=64)
+            audio = deemphasis(audio, AUDIO_RATE)
+            m = np.max(np.abs(audio))
+            if m > 0:
+                audio = audio / m * 0.8
+            server.publish(audio)
+    return run
+
+
+def tone_source(freq=440.0, block=6144):
+    # fuente sintética a ritmo de tiempo real (mismo tamaño de bloque que 128k IQ @ 1.024 MS/s)
+    def run(server):
+        n = 0
+        t_next = time.time()
+        while True:
+            t = (n + np.arange(block)) / AUDIO_RATE
+            server.publish(0.5 * np.sin(2 * np.pi * freq * t))
+            n += block
+            t_next += block / AUDIO_RATE
+            time.sleep(max(0.0, t_next - time.time()))
+    return run
+
+
+def main():
+    source = tone_source() if "--tono" in sys.argv else sdr_source()
+    server = AudioServer()
+    print(f"📻 Servidor de audio en http://0.0.0.0:{server.port}/audio.wav  (ws: /ws, stats: /stats)")
+    try:
+        server.run(source)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# Calibración de tamaños de bloque por equipo
+# - Reproduce IQ grabado (o FM sintética) por el pipeline de fm_receiver_pipeline
+#   en una grilla de tamaños de bloque × profundidades de cola
+# - Por cada punto mide:
+#     margen (headroom): segundos de señal procesados por segundo, sin ritmo
+#     latencia: a ritmo de tiempo real, llenado del bloque + desde que está completo
+#               hasta que su audio está listo (p95) + el frame de audio
+#     jitter de entrega del audio → tamaño de frame de audio y de su cola
+# - Elige la menor latencia con margen suficiente y la guarda en autotune.json
+#   por equipo y tasa de muestreo; fm_receiver_pipeline.py la carga al arrancar
+#
+# Uso:
+#   python fm_autotune.py [grabacion.cu8|.cf32] [--rapido]
+#   python fm_autotune.py --mostrar
+
+import os
+import sys
+import json
+import math
+import time
+import socket
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(HERE, "autotune.json")
+AUDIO_RATE = 48000
+
+BLOCKS = (32 * 1024, 64 * 1024, 128 * 1024, 256 * 1024, 512 * 1024)
+DEPTHS = (2, 4, 8)
+AUDIO_FRAMES = (256, 512, 1024, 2048, 4096)
+MIN_HEADROOM = 2.0        # el doble de tiempo real: margen para el SO, la GUI, etc.
+
+# ------------------------------------------
+#  CONFIGURACIÓN GUARDADA
+# ------------------------------------------
+
+def host_key():
+    return f"{socket.gethostname()}/{os.cpu_count()}cpu"
+
+
+def load_config(sample_rate, defaults=None, path=CONFIG_PATH):
+    # devuelve los valores calibrados para este equipo y tasa, o `defaults`
+    cfg = dict(defaults or {})
+    try:
+        with open(path) as f:
+            stored = json.load(f).get(host_key(), {}).get(str(int(sample_rate)))
+    except (OSError, ValueError):
+        stored = None
+    if stored:
+        cfg.update({k: stored[k] for k in ("block", "depth", "audio_frame", "audio_queue")
+                    if k in stored})
+    return cfg
+
+
+def save_config(sample_rate, result, path=CONFIG_PATH):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    data.setdefault(host_key(), {})[str(int(sample_rate))] = result
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+# ------------------------------------------
+#  FUENTE DE IQ
+# ------------------------------------------
+
+def load_iq(path, seconds, default_rate=1.024e6):
+    from fm_batch_demod import iq_format, open_iq, iq_length, read_iq, sample_rate_for
+    fmt = iq_format(path)
+    rate = sample_rate_for(path, default_rate)
+    n = min(iq_length(path, fmt), int(seconds * rate))
+    return read_iq(open_iq(path, fmt), fmt, 0, n).astype(np.complex64), rate
+
+
+def synthetic_iq(seconds, rate=1.024e6):
+    from fm_discriminators import synthetic_fm
+    return synthetic_fm(int(seconds * rate), rate, cnr_db=25.0), rate
+
+
+class Replay:
+    # entrega bloques del IQ en bucle; con paced=True al ritmo del dongle
+    def __init__(self, iq, rate, block, paced):
+        self.iq = iq
+        self.rate = rate
+        self.block = block
+        self.paced = paced
+        self.pos = 0
+        self.k = 0
+        self.t0 = None
+        self.arrivals = []
+
+    def __call__(self, out):
+        if self.t0 is None:
+            self.t0 = time.perf_counter()
+        if self.pos + self.block > len(self.iq):
+            self.pos = 0
+        out[:] = self.iq[self.pos:self.pos + self.block]
+        self.pos += self.block
+        self.k += 1
+        ready = self.t0 + self.k * self.block / self.rate
+        if self.paced:
+            time.sleep(max(0.0, ready - time.perf_counter()))
+        self.arrivals.append(max(ready, time.perf_counter()) if self.paced else time.perf_counter())
+        return out
+
+# ------------------------------------------
+#  MEDICIÓN
+# ------------------------------------------
+
+def run_point(iq, rate, block, depth, seconds, paced, fm_demod):
+    from fm_pipeline import BlockPool, Pipeline, Stage
+    from fm_receiver_pipeline import build_stages
+
+    src = Replay(iq, rate, block, paced)
+    n_blocks = max(4, int(seconds * rate / block))
+    done = []
+
+    def source(out):
+        if src.k >= n_blocks:
+            return None
+        return src(out)
+
+    pipe = Pipeline(Stage("captura", source, BlockPool(block, np.complex64, depth + 2)),
+                    build_stages(fm_demod, rate, block, depth),
+                    sink=lambda audio: done.append(time.perf_counter()), depth=depth)
+    t0 = time.perf_counter()
+    report = pipe.run()
+    wall = time.perf_counter() - t0
+    latency = np.array(done) - np.array(src.arrivals[:len(done)])
+    return {"wall": wall, "signal": n_blocks * block / rate, "latency": latency,
+            "deliveries": np.array(done), "report": report}
+
+
+def audio_framing(deliveries, block, rate):
+    # el frame de audio debe cubrir el jitter de entrega; la cola, un bloque + jitter
+    from fm_receiver_pipeline import audio_ratio
+    up, down = audio_ratio(rate)
+    intervals = np.diff(deliveries)
+    jitter = float(np.percentile(np.abs(intervals - block / rate), 95)) if len(intervals) > 1 else 0.0
+    frame = next((f for f in AUDIO_FRAMES if f / AUDIO_RATE >= 2 * jitter), AUDIO_FRAMES[-1])
+    per_block = block * up / down   # muestras de audio por bloque
+    queue_frames = math.ceil((per_block + 2 * jitter * AUDIO_RATE) / frame) + 2
+    return frame, queue_frames, jitter
+
+
+def calibrate(iq, rate, blocks=BLOCKS, depths=DEPTHS, seconds=3.0, min_headroom=MIN_HEADROOM, log=print):
+    import fm_discriminators
+    fm_discriminators.warm()
+    from fm_receiver_pipeline import DISCRIMINATOR
+    demod = fm_discriminators.get_discriminator(DISCRIMINATOR)     # el mismo que usa el receptor
+
+    grid = []
+    for block in blocks:
+        for depth in depths:
+            free = run_point(iq, rate, block, depth, seconds, False, demod)
+            headroom = free["signal"] / free["wall"]
+            point = {"block": block, "depth": depth, "headroom": round(headroom, 2)}
+            if headroom >= 1.0:
+                paced = run_point(iq, rate, block, depth, seconds, True, demod)
+                frame, qlen, jitter = audio_framing(paced["deliveries"], block, rate)
+                # llenado del bloque + procesamiento/colas (p95) + un frame en el dispositivo
+                lat = block / rate + float(np.percentile(paced["latency"], 95)) + frame / AUDIO_RATE
+                point.update(latency_ms=round(lat * 1000, 1), jitter_ms=round(jitter * 1000, 2),
+                             audio_frame=frame, audio_queue=qlen)
+            grid.append(point)
+            if log:
+                lat = f"{point['latency_ms']:7.1f} ms" if "latency_ms" in point else "    —    "
+                log(f"   bloque {block:7d}  cola {depth}  margen {headroom:5.1f}×  latencia p95 {lat}")
+
+    ok = [p for p in grid if p["headroom"] >= min_headroom and "latency_ms" in p]
+    if ok:
+        best = min(ok, key=lambda p: (p["latency_ms"], -p["headroom"]))
+    else:
+        best = max(grid, key=lambda p: p["headroom"])
+        best.setdefault("audio_frame", 1024)
+        best.setdefault("audio_queue", 10)
+    result = dict(best, sample_rate=rate, measured=time.strftime("%Y-%m-%d %H:%M:%S"),
+                  min_headroom=min_headroom, grid=grid)
+    return result
+
+
+def main():
+    if "--mostrar" in sys.argv:
+        try:
+            with open(CONFIG_PATH) as f:
+                print(json.dumps(json.load(f).get(host_key(), {}), indent=2))
+        except OSError:
+            print(f"sin calibración guardada ({CONFIG_PATH})")
+        return
+
+    rapido = "--rapido" in sys.argv
+    seconds = 1.5 if rapido else 3.0
+    files = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if files:
+        iq, rate = load_iq(files[0], 10.0)
+        print(f"📼 {files[0]}: {len(iq) / rate:.1f} s a {rate / 1e6:.3f} MS/s")
+    else:
+        iq, rate = synthetic_iq(10.0)
+        print("📼 sin grabación: FM sintética a 1.024 MS/s")
+
+    print(f"⏱  calibrando en {host_key()} (margen mínimo {MIN_HEADROOM}×)…")
+    blocks = BLOCKS[1:4] if rapido else BLOCKS
+    result = calibrate(iq, rate, blocks=blocks, seconds=seconds)
+    save_config(rate, result)
+    print(f"\n✅ bloque {result['block']}, cola {result['depth']}, frame de audio {result['audio_frame']} "
+          f"(cola {result['audio_queue']}) → {CONFIG_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# Demodulación FM por lotes de archivos IQ (auditoría de grabaciones)
+# - Cada archivo se parte en trozos alineados al factor de decimación
+# - Cada trozo se procesa con un solape antes y después (filtros, de-énfasis
+#   y resample_poly quedan "cebados"), y sólo se conserva su parte central
+# - Los trozos corren en un ProcessPoolExecutor; entradas y salida son memmap:
+#   ningún trabajador recibe ni devuelve muestras por pickle, escribe directo
+#   en su rango del WAV de salida → el resultado empalma sin costuras
+#
+# Uso:
+#   python fm_batch_demod.py archivo1.cf32 archivo2.cu8 ... [--rate 1.024e6] [--workers N] [--out salida/]
+#   python fm_batch_demod.py largo.cu8 --bench      → tiempos con 1..N procesos
+# La frecuencia de muestreo se toma del .json que deja fm_recorder.py si existe.
+
+import os
+import sys
+import json
+import time
+import struct
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import scipy.signal as sig
+
+AUDIO_RATE = 48000
+CHUNK = 1 << 22                 # muestras IQ por trozo (~4 s a 1.024 MS/s)
+OVERLAP = 8192                  # muestras IQ de solape a cada lado
+MAX_DEVIATION = 75e3            # desviación FM comercial → escala fija de audio
+
+# ------------------------------------------
+#  CADENA FM
+# ------------------------------------------
+
+def fm_demod(iq):
+    # misma longitud que la entrada para conservar la alineación de índices
+    prev = np.concatenate((iq[:1], iq[:-1]))
+    return np.angle(iq * np.conj(prev))
+
+def deemphasis(audio, fs=48000):
+    tau = 75e-6
+    a = np.exp(-1/(fs*tau))
+    b = [1 - a]
+    a = [1, -a]
+    return sig.lfilter(b, a, audio)
+
+# ------------------------------------------
+#  ARCHIVOS
+# ------------------------------------------
+
+def iq_format(path):
+    return "cu8" if path.lower().endswith((".cu8", ".bin")) else "cf32"
+
+
+def open_iq(path, fmt):
+    if fmt == "cu8":
+        return np.memmap(path, dtype=np.uint8, mode="r")
+    return np.memmap(path, dtype=np.complex64, mode="r")
+
+
+def iq_length(path, fmt):
+    size = os.path.getsize(path)
+    return size // 2 if fmt == "cu8" else size // 8
+
+
+def read_iq(mm, fmt, a, b):
+    if fmt == "cu8":
+        raw = np.asarray(mm[2 * a:2 * b], dtype=np.float32)
+        return (raw.view(np.complex64) - (127.5 + 127.5j)) / 127.5
+    return np.asarray(mm[a:b])
+
+
+def sample_rate_for(path, default):
+    meta = os.path.splitext(path)[0] + ".json"
+    if os.path.exists(meta):
+        with open(meta) as f:
+            return float(json.load(f)["sample_rate"])
+    return default
+
+
+def create_wav(path, n, rate=AUDIO_RATE):
+    # cabecera PCM de 44 bytes + datos preasignados para escribir por memmap
+    header = struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36 + 2 * n, b"WAVE", b"fmt ", 16,
+                         1, 1, rate, rate * 2, 2, 16, b"data", 2 * n)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(44 + 2 * n)
+    return 44
+
+# ------------------------------------------
+#  TRABAJADOR
+# ------------------------------------------
+
+def demod_chunk(task):
+    path, fmt, fs, start, end, total, out_path, out_offset = task
+    ratio = Fraction(AUDIO_RATE, int(round(fs)))
+    up, down = ratio.numerator, ratio.denominator
+
+    # solape redondeado a múltiplo de down (8192 no lo es a 2.4 MS/s: down = 50)
+    ov = -(-OVERLAP // down) * down
+    a = max(0, start - ov)
+    b = min(total, end + ov)
+    iq = read_iq(open_iq(path, fmt), fmt, a, b)
+
+    lpf = sig.firwin(101, cutoff=100e3, fs=fs)
+    channel = sig.lfilter(lpf, 1.0, iq)
+    demod = fm_demod(channel)
+    audio = sig.resample_poly(demod, up=up, down=down)
+    audio = deemphasis(audio, AUDIO_RATE)
+
+    # start, a y end son múltiplos de down → índices de salida exactos
+    k0 = (start - a) * up // down
+    n = (end - start) * up // down
+    scale = 0.8 / (2 * np.pi * MAX_DEVIATION / fs)
+    pcm = np.clip(audio[k0:k0 + n] * scale * 32767, -32768, 32767).astype("<i2")
+
+    out = np.memmap(out_path, dtype="<i2", mode="r+", offset=out_offset)
+    out[start * up // down:start * up // down + n] = pcm
+    out.flush()
+    return end - start
+
+# ------------------------------------------
+#  PLANIFICACIÓN
+# ------------------------------------------
+
+def plan(paths, default_rate, out_dir, chunk=CHUNK):
+    tasks = []
+    outputs = []
+    for path in paths:
+        fmt = iq_format(path)
+        fs = sample_rate_for(path, default_rate)
+        ratio = Fraction(AUDIO_RATE, int(round(fs)))
+        up, down = ratio.numerator, ratio.denominator
+        step = max(down, chunk - chunk % down)
+
+        total = iq_length(path, fmt)
+        total -= total % down
+        n_out = total * up // down
+
+        out_path = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + ".wav")
+        offset = create_wav(out_path, n_out)
+        outputs.append(out_path)
+
+        for start in range(0, total, step):
+            tasks.append((path, fmt, fs, start, min(start + step, total), total, out_path, offset))
+    return tasks, outputs
+
+
+def run(paths, default_rate=1.024e6, workers=None, out_dir=".", chunk=CHUNK):
+    os.makedirs(out_dir, exist_ok=True)
+    tasks, outputs = plan(paths, default_rate, out_dir, chunk)
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        done = sum(pool.map(demod_chunk, tasks))
+    return outputs, done, time.perf_counter() - t0
+
+
+def main():
+    args = sys.argv[1:]
+    opts = {"--rate": 1.024e6, "--workers": None, "--out": "."}
+    paths = []
+    i = 0
+    while i < len(args):
+        if args[i] in opts:
+            opts[args[i]] = args[i + 1]
+            i += 2
+        elif args[i] == "--bench":
+            opts["--bench"] = True
+            i += 1
+        else:
+            paths.append(args[i])
+            i += 1
+
+    if not paths:
+        print("uso: python fm_batch_demod.py archivos... [--rate R] [--workers N] [--out DIR] [--bench]")
+        return
+
+    rate = float(opts["--rate"])
+    if opts.get("--bench"):
+        cores = os.cpu_count() or 1
+        base = None
+        print(" procesos  tiempo (s)  MS/s    aceleración")
+        for w in sorted({1, 2, 4, cores} & set(range(1, cores + 1))):
+            _, done, elapsed = run(paths, rate, w, opts["--out"])
+            base = base or elapsed
+            print(f" {w:8d}  {elapsed:10.2f}  {done / elapsed / 1e6:6.1f}  {base / elapsed:6.2f}x")
+        return
+
+    workers = int(opts["--workers"]) if opts["--workers"] else None
+    outputs, done, elapsed = run(paths, rate, workers, opts["--out"])
+    seconds = done / rate
+    print(f"✔ {len(outputs)} archivo(s), {done / 1e6:.1f} M muestras en {elapsed:.1f} s "
+          f"({done / elapsed / 1e6:.1f} MS/s, ~{seconds / elapsed:.0f}x tiempo real a {rate / 1e6:.3f} MS/s)")
+    for p in outputs:
+        print("  🎵", p)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# Detector CFAR sobre la salida FFT → eventos de ocupación
+# - CA-CFAR (promedio de celdas) con sumas acumuladas: O(N) para todos los bines
+# - OS-CFAR (estadístico de orden) con ventanas deslizantes + np.partition
+# - Detecciones adyacentes → portadoras (centroide, ancho de banda, pico)
+# - Seguimiento en el tiempo: sólo se emiten eventos start/stop compactos
+#   (frecuencia, ancho de banda, pico, duración), no espectros crudos
+
+import time
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ------------------------------------------
+#  CFAR
+# ------------------------------------------
+
+def ca_alpha(n_train, pfa):
+    # factor de umbral CA-CFAR para ruido exponencial (detector cuadrático)
+    return n_train * (pfa ** (-1.0 / n_train) - 1.0)
+
+
+def ca_cfar(power, guard=4, train=16, pfa=1e-4):
+    # power: potencia lineal (1D por cuadro o 2D cuadros × bines)
+    power = np.atleast_2d(power)
+    w = guard + train
+    p = np.pad(power, ((0, 0), (w, w)), mode="reflect")
+    c = np.concatenate((np.zeros((p.shape[0], 1)), np.cumsum(p, axis=1)), axis=1)
+    n = power.shape[1]
+    i = np.arange(n) + w
+    left = c[:, i - guard] - c[:, i - w]
+    right = c[:, i + w + 1] - c[:, i + guard + 1]
+    noise = (left + right) / (2 * train)
+    return power > ca_alpha(2 * train, pfa) * noise, noise
+
+
+def os_cfar(power, guard=4, train=16, rank=0.75, scale_db=12.0):
+    # rango k = rank * 2·train: robusto frente a portadoras vecinas en la ventana
+    power = np.atleast_2d(power)
+    w = guard + train
+    p = np.pad(power, ((0, 0), (w, w)), mode="reflect")
+    win = sliding_window_view(p, 2 * w + 1, axis=1)
+    cells = np.concatenate((win[..., :train], win[..., -train:]), axis=-1)
+    k = min(int(rank * 2 * train), 2 * train - 1)
+    noise = np.partition(cells, k, axis=-1)[..., k]
+    return power > 10 ** (scale_db / 10) * noise, noise
+
+# ------------------------------------------
+#  AGRUPACIÓN EN PORTADORAS
+# ------------------------------------------
+
+def merge_detections(mask, power, bin_hz, f0, merge_gap=2, min_bins=1):
+    # mask/power: 1D de un cuadro. Devuelve arreglos (freq, bandwidth, peak_db)
+    m = np.concatenate(([0], mask.astype(np.int8), [0]))
+    d = np.diff(m)
+    starts = np.flatnonzero(d == 1)
+    ends = np.flatnonzero(d == -1)          # exclusivo
+    if len(starts) == 0:
+        empty = np.zeros(0)
+        return empty, empty, empty
+
+    # unir tramos separados por huecos pequeños
+    keep = np.concatenate(([True], starts[1:] - ends[:-1] > merge_gap))
+    starts = starts[keep]
+    ends = ends[np.concatenate((keep[1:], [True]))]
+    wide = ends - starts >= min_bins
+    starts, ends = starts[wide], ends[wide]
+    if len(starts) == 0:
+        empty = np.zeros(0)
+        return empty, empty, empty
+
+    # centroide ponderado por potencia y pico por tramo (bincount/reduceat, sin bucles)
+    n = len(power)
+    edges = np.zeros(n + 1, dtype=np.int32)
+    np.add.at(edges, starts, 1)
+    np.add.at(edges, ends, -1)
+    sel = np.flatnonzero(np.cumsum(edges[:n]) > 0)
+    marks = np.zeros(n, dtype=np.int32)
+    marks[starts] = 1
+    seg = (np.cumsum(marks) - 1)[sel]
+    pw = power[sel]
+    wsum = np.bincount(seg, weights=pw)
+    centroid = np.bincount(seg, weights=pw * sel) / wsum
+    peak = np.maximum.reduceat(pw, np.concatenate(([0], np.cumsum(ends - starts)[:-1])))
+
+    freq = f0 + centroid * bin_hz
+    bandwidth = (ends - starts) * bin_hz
+    return freq, bandwidth, 10 * np.log10(peak + 1e-20)
+
+# ------------------------------------------
+#  SEGUIMIENTO Y EVENTOS
+# ------------------------------------------
+
+class CarrierTracker:
+    def __init__(self, freq_tol=25e3, min_hits=3, hang=2.0):
+        self.freq_tol = freq_tol
+        self.min_hits = min_hits        # cuadros seguidos antes de emitir "start"
+        self.hang = hang                # segundos sin detección antes de "stop"
+        self.tracks = []
+        self._next_id = 0
+
+    def update(self, freq, bandwidth, peak_db, now=None):
+        if now is None:
+            now = time.time()
+        events = []
+
+        # asociación al track más cercano dentro de la tolerancia
+        used = np.zeros(len(freq), dtype=bool)
+        matched = set()
+        if self.tracks and len(freq):
+            tf = np.array([t["freq"] for t in self.tracks])
+            dist = np.abs(tf[:, None] - freq[None, :])
+            for ti in np.argsort(dist.min(axis=1)):
+                j = int(np.argmin(np.where(used, np.inf, dist[ti])))
+                if used[j] or dist[ti, j] > self.freq_tol:
+                    continue
+                used[j] = True
+                matched.add(int(ti))
+                t = self.tracks[ti]
+                t["freq"] = 0.8 * t["freq"] + 0.2 * freq[j]
+                t["bandwidth"] = max(t["bandwidth"], bandwidth[j])
+                t["peak_db"] = max(t["peak_db"], peak_db[j])
+                t["last_seen"] = now
+                t["hits"] += 1
+                if t["hits"] == self.min_hits:
+                    events.append(self._event("start", t, now))
+
+        # sin confirmar, un cuadro sin detección reinicia la cuenta: ruido intermitente
+        # no acumula hits dentro del hang
+        for ti, t in enumerate(self.tracks):
+            if ti not in matched and t["hits"] < self.min_hits:
+                t["hits"] = 0
+
+        for j in np.flatnonzero(~used):
+            self.tracks.append({"id": self._next_id, "freq": float(freq[j]),
+                                "bandwidth": float(bandwidth[j]), "peak_db": float(peak_db[j]),
+                                "first_seen": now, "last_seen": now, "hits": 1})
+            self._next_id += 1
+            if self.min_hits <= 1:
+                events.append(self._event("start", self.tracks[-1], now))
+
+        alive = []
+        for t in self.tracks:
+            if now - t["last_seen"] > self.hang:
+                if t["hits"] >= self.min_hits:
+                    events.append(self._event("stop", t, t["last_seen"]))
+            else:
+                alive.append(t)
+        self.tracks = alive
+        return events
+
+    def flush(self):
+        # cierra los tracks abiertos; como en update(), el stop lleva la hora en que se vio por última vez
+        events = [self._event("stop", t, t["last_seen"]) for t in self.tracks if t["hits"] >= self.min_hits]
+        self.tracks = []
+        return events
+
+    def _event(self, kind, t, now):
+        return {"type": kind, "id": t["id"], "time": now, "freq": round(float(t["freq"]), 1),
+                "bandwidth": round(float(t["bandwidth"]), 1), "peak_db": round(float(t["peak_db"]), 1),
+                "duration": round(float(t["last_seen"] - t["first_seen"]), 3)}
+
+# ------------------------------------------
+#  ETAPA COMPLETA
+# ------------------------------------------
+
+class OccupancyDetector:
+    # Antes del CFAR el espectro se reduce a `bins` bines (promedio de bines vecinos) y se
+    # integran `integrate` cuadros: menos varianza del ruido y menos CPU.
+    # OS-CFAR (por defecto) con ventana ancha y rango bajo detecta portadoras anchas
+    # (FM comercial) sin auto-enmascararse; CA-CFAR es más barato y va bien para
+    # portadoras angostas.
+    def __init__(self, center_freq, sample_rate, fft_size, method="os", bins=2048, integrate=4,
+                 guard=2, train=256, pfa=1e-4, rank=0.25, scale_db=6.0, merge_gap=2, min_bins=2,
+                 **tracker_args):
+        self.center_freq = center_freq
+        self.sample_rate = sample_rate
+        self.fft_size = fft_size
+        self.reduce = max(1, fft_size // bins)
+        self.bin_hz = sample_rate / fft_size * self.reduce
+        self.f0 = center_freq - sample_rate / 2 + self.bin_hz / 2
+        self.method = method
+        self.integrate = integrate
+        self.cfar_args = dict(guard=guard, train=train)
+        if method == "ca":
+            self.cfar_args["pfa"] = pfa
+        else:
+            self.cfar_args.update(rank=rank, scale_db=scale_db)
+        self.merge_gap = merge_gap
+        self.min_bins = min_bins
+        self.tracker = CarrierTracker(**tracker_args)
+        self._acc = None
+        self._count = 0
+
+    def process(self, power, now=None):
+        # power: espectro lineal con fftshift (bines de -fs/2 a +fs/2)
+        power = np.asarray(power, dtype=np.float64)
+        n = len(power) - len(power) % self.reduce
+        p = power[:n].reshape(-1, self.reduce).mean(axis=1)
+
+        self._acc = p if self._acc is None else self._acc + p
+        self._count += 1
+        if self._count < self.integrate:
+            return []
+        p = self._acc / self._count
+        self._acc = None
+        self._count = 0
+
+        cfar = ca_cfar if self.method == "ca" else os_cfar
+        mask, _ = cfar(p, **self.cfar_args)
+        freq, bw, peak = merge_detections(mask[0], p, self.bin_hz, self.f0,
+                                          self.merge_gap, self.min_bins)
+        return self.tracker.update(freq, bw, peak, now)
@@ -0,0 +1,170 @@
+# Discriminadores FM intercambiables (misma firma que fm_demod: iq → fase por muestra)
+# - "exacto":      atan2 completo (np.angle), referencia
+# - "exacto_numba": atan2 completo en el kernel numba de fm_kernels.py
+# - "atan_poly9":  atan2 por octantes con polinomio de grado 9 (error ~1e-5 rad)
+# - "atan_poly3":  ídem con grado 3 (error ~5e-3 rad), menos operaciones
+# - "cuadratura":  (I·dQ − Q·dI) / (I² + Q²), sin arcotangente (≈ sen Δφ)
+# Todos los aproximados en float32, como kernels numba nogil (ver fm_kernels.py).
+# measure() arma la tabla SNR de audio vs throughput y choose() elige el más
+# barato que cumple un mínimo de calidad (test_discriminators.py la imprime).
+
+import time
+import numpy as np
+from numba import njit
+
+import fm_kernels
+
+# ------------------------------------------
+#  KERNELS
+# ------------------------------------------
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _atan2_poly9(y, x):
+    ax = abs(x)
+    ay = abs(y)
+    mx = max(ax, ay)
+    if mx == 0.0:
+        return np.float32(0.0)
+    r = min(ax, ay) / mx
+    r2 = r * r
+    a = r * (np.float32(0.99986600) + r2 * (np.float32(-0.33029950) + r2 * (np.float32(0.18014100)
+            + r2 * (np.float32(-0.08513300) + r2 * np.float32(0.02083510)))))
+    if ay > ax:
+        a = np.float32(np.pi / 2) - a
+    if x < 0:
+        a = np.float32(np.pi) - a
+    return -a if y < 0 else a
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _atan2_poly3(y, x):
+    ax = abs(x)
+    ay = abs(y)
+    mx = max(ax, ay)
+    if mx == 0.0:
+        return np.float32(0.0)
+    r = min(ax, ay) / mx
+    a = r * (np.float32(0.97239411) - np.float32(0.19194795) * r * r)
+    if ay > ax:
+        a = np.float32(np.pi / 2) - a
+    if x < 0:
+        a = np.float32(np.pi) - a
+    return -a if y < 0 else a
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def fm_demod_poly9(iq):
+    out = np.empty(len(iq)-1, dtype=np.float32)
+    for i in range(len(iq)-1):
+        a, b = iq[i+1], iq[i]
+        re = np.float32(a.real * b.real + a.imag * b.imag)
+        im = np.float32(a.imag * b.real - a.real * b.imag)
+        out[i] = _atan2_poly9(im, re)
+    return out
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def fm_demod_poly3(iq):
+    out = np.empty(len(iq)-1, dtype=np.float32)
+    for i in range(len(iq)-1):
+        a, b = iq[i+1], iq[i]
+        re = np.float32(a.real * b.real + a.imag * b.imag)
+        im = np.float32(a.imag * b.real - a.real * b.imag)
+        out[i] = _atan2_poly3(im, re)
+    return out
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def fm_demod_quadrature(iq):
+    out = np.empty(len(iq)-1, dtype=np.float32)
+    for i in range(len(iq)-1):
+        I = np.float32(iq[i+1].real)
+        Q = np.float32(iq[i+1].imag)
+        dI = I - np.float32(iq[i].real)
+        dQ = Q - np.float32(iq[i].imag)
+        p = I * I + Q * Q
+        out[i] = (I * dQ - Q * dI) / p if p > 0 else np.float32(0.0)
+    return out
+
+
+def fm_demod_exact(iq):
+    return np.angle(iq[1:] * np.conj(iq[:-1]))
+
+# ------------------------------------------
+#  REGISTRO
+# ------------------------------------------
+
+DISCRIMINATORS = {
+    "exacto": fm_demod_exact,
+    "exacto_numba": fm_kernels.fm_demod,
+    "atan_poly9": fm_demod_poly9,
+    "atan_poly3": fm_demod_poly3,
+    "cuadratura": fm_demod_quadrature,
+}
+
+
+def get_discriminator(name="exacto"):
+    try:
+        return DISCRIMINATORS[name]
+    except KeyError:
+        raise ValueError(f"discriminador desconocido: {name} (opciones: {', '.join(DISCRIMINATORS)})")
+
+
+def warm():
+    # compila (o carga de caché) los kernels para complex64 y complex128
+    for fn in DISCRIMINATORS.values():
+        fn(np.zeros(2, dtype=np.complex64))
+        fn(np.zeros(2, dtype=np.complex128))
+
+# ------------------------------------------
+#  MEDICIÓN: SNR DE AUDIO VS THROUGHPUT
+# ------------------------------------------
+
+def synthetic_fm(n, fs=1.024e6, tone=1e3, deviation=75e3, cnr_db=None, seed=0):
+    t = np.arange(n) / fs
+    iq = np.exp(1j * deviation / tone * np.sin(2 * np.pi * tone * t))
+    if cnr_db is not None:
+        rng = np.random.default_rng(seed)
+        s = np.sqrt(10 ** (-cnr_db / 10) / 2)
+        iq = iq + s * (rng.standard_normal(n) + 1j * rng.standard_normal(n))
+    return iq.astype(np.complex64)
+
+
+def audio_snr(demod, fs=1.024e6, tone=1e3):
+    # SINAD del tono tras llevarlo a 48 kHz y limitarlo a 15 kHz, en dB
+    import scipy.signal as sig
+    audio = sig.resample_poly(demod.astype(np.float64), 3, 64)
+    audio = sig.sosfiltfilt(sig.butter(8, 15e3, fs=48000, output="sos"), audio)
+    audio = audio[len(audio) // 10: -len(audio) // 10]
+    t = np.arange(len(audio)) / 48000
+    basis = np.column_stack((np.sin(2 * np.pi * tone * t), np.cos(2 * np.pi * tone * t), np.ones_like(t)))
+    coef, *_ = np.linalg.lstsq(basis, audio, rcond=None)
+    fit = basis[:, :2] @ coef[:2]
+    resid = audio - basis @ coef
+    return 10 * np.log10(np.sum(fit ** 2) / np.sum(resid ** 2))
+
+
+def measure(n=1 << 20, fs=1.024e6, cnr_db=(None, 20.0), repeat=5):
+    # una fila por discriminador: Msps y SNR de audio para cada CNR de entrada
+    warm()
+    signals = {c: synthetic_fm(n, fs, cnr_db=c) for c in cnr_db}
+    rows = []
+    for name, fn in DISCRIMINATORS.items():
+        x = signals[cnr_db[0]]
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(x)
+            best = min(best, time.perf_counter() - t0)
+        rows.append({"name": name, "msps": n / best / 1e6,
+                     "snr_db": {str(c): round(audio_snr(fn(s), fs), 1) for c, s in signals.items()}})
+    return rows
+
+
+def choose(min_snr_db, table=None, cnr_db=None):
+    # el más rápido cuyo SNR (a la CNR indicada, por defecto sin ruido) cumple el mínimo
+    table = table or measure()
+    ok = [r for r in table if r["snr_db"][str(cnr_db)] >= min_snr_db]
+    if not ok:
+        return "exacto"
+    return max(ok, key=lambda r: r["msps"])["name"]
@@ -0,0 +1,166 @@
+# Proveedor de FFT intercambiable para espectro/cascada
+# - Backends: "numpy", "scipy" (scipy.fft con workers=N) y "fftw" (pyFFTW, sólo si
+#   está instalado; se ignora si no)
+# - Ventanas y planes cacheados por (tamaño, dtype): el plan FFTW se crea una vez
+# - Transformadas sobre buffers preasignados: la ventana se multiplica dentro del
+#   buffer de entrada y la FFT escribe en el de salida (o in-place)
+# - fftshift sin costo: la ventana se multiplica por (-1)^n, lo que centra el
+#   espectro directamente (N par; con N impar se usa np.fft.fftshift)
+# - backend="auto": mide una vez por tamaño y usa el más rápido del equipo
+#   (test_fft_backends.py imprime la tabla completa)
+
+import os
+import time
+import inspect
+import threading
+from functools import lru_cache
+import numpy as np
+import scipy.fft
+
+try:
+    import pyfftw
+except ImportError:
+    pyfftw = None
+
+WORKERS = os.cpu_count() or 1
+_NUMPY_OUT = "out" in inspect.signature(np.fft.fft).parameters    # numpy >= 2.0
+
+# ------------------------------------------
+#  VENTANAS
+# ------------------------------------------
+
+@lru_cache(maxsize=32)
+def window(size, dtype=np.complex64, kind="hann", shift=True):
+    w = np.hanning(size) if kind == "hann" else np.ones(size)
+    if shift and size % 2 == 0:
+        w = w * np.where(np.arange(size) % 2, -1.0, 1.0)
+    w = w.astype(np.dtype(dtype).char.lower() if np.dtype(dtype).kind == "c" else dtype)
+    w.flags.writeable = False
+    return w
+
+# ------------------------------------------
+#  BACKENDS
+# ------------------------------------------
+# plan(size, dtype) → (entrada, ejecutar): se escribe en `entrada` y ejecutar()
+# devuelve la salida (un buffer del propio plan, reutilizado en cada llamada)
+
+class NumpyBackend:
+    name = "numpy"
+
+    def plan(self, size, dtype):
+        buf = np.empty(size, dtype=dtype)
+        out = np.empty(size, dtype=dtype)
+        if _NUMPY_OUT:
+            return buf, lambda: np.fft.fft(buf, out=out)
+
+        def run():
+            out[:] = np.fft.fft(buf)
+            return out
+        return buf, run
+
+
+class ScipyBackend:
+    name = "scipy"
+
+    def __init__(self, workers=WORKERS):
+        self.workers = workers
+
+    def plan(self, size, dtype):
+        buf = np.empty(size, dtype=dtype)
+        # in-place sobre la entrada (que ya es una copia con la ventana)
+        return buf, lambda: scipy.fft.fft(buf, overwrite_x=True, workers=self.workers)
+
+
+class FftwBackend:
+    name = "fftw"
+
+    def __init__(self, threads=WORKERS, effort="FFTW_MEASURE"):
+        self.threads = threads
+        self.effort = effort
+
+    def plan(self, size, dtype):
+        buf = pyfftw.empty_aligned(size, dtype=dtype)
+        out = pyfftw.empty_aligned(size, dtype=dtype)
+        # FFTW_MEASURE cuesta la primera vez; la "wisdom" queda en memoria
+        fftw = pyfftw.FFTW(buf, out, threads=self.threads, flags=(self.effort,))
+        return buf, fftw
+
+
+def available_backends():
+    backends = {"numpy": NumpyBackend(), "scipy": ScipyBackend()}
+    if pyfftw is not None:
+        backends["fftw"] = FftwBackend()
+    return backends
+
+
+BACKENDS = available_backends()
+
+# ------------------------------------------
+#  PROVEEDOR
+# ------------------------------------------
+
+_plans = threading.local()      # los buffers del plan no se comparten entre hilos
+_best = {}
+
+
+def get_plan(backend, size, dtype):
+    cache = _plans.__dict__.setdefault("cache", {})
+    key = (backend, size, np.dtype(dtype).str)
+    if key not in cache:
+        cache[key] = BACKENDS[backend].plan(size, np.dtype(dtype))
+    return cache[key]
+
+
+class FFTProvider:
+    def __init__(self, size, dtype=np.complex64, backend="auto", window_kind="hann", shift=True):
+        self.size = size
+        self.dtype = np.dtype(dtype)
+        self.backend = fastest_backend(size, dtype) if backend == "auto" else backend
+        if self.backend not in BACKENDS:
+            raise ValueError(f"backend no disponible: {self.backend} (opciones: {', '.join(BACKENDS)})")
+        self.window = window(size, self.dtype, window_kind, shift)
+        self._fftshift = shift and size % 2 == 1     # (-1)^n sólo centra con N par
+        self._in, self._run = get_plan(self.backend, size, self.dtype)
+        self._power = np.empty(size, dtype=np.float32)
+
+    def spectrum(self, x):
+        # espectro complejo centrado; la salida es un buffer reutilizado (copiar si se guarda)
+        np.multiply(x[-self.size:], self.window, out=self._in, casting="unsafe")
+        X = self._run()
+        return np.fft.fftshift(X) if self._fftshift else X
+
+    def power_db(self, x, out=None):
+        X = self.spectrum(x)
+        out = self._power if out is None else out
+        np.abs(X, out=out, casting="unsafe")
+        np.maximum(out, 1e-12, out=out)
+        np.log10(out, out=out)
+        out *= 20
+        return out
+
+# ------------------------------------------
+#  BENCHMARK
+# ------------------------------------------
+
+def time_backend(backend, size, dtype=np.complex64, repeat=20):
+    x = (np.random.default_rng(0).standard_normal(size) * (1 + 1j)).astype(dtype)
+    fft = FFTProvider(size, dtype, backend)
+    fft.power_db(x)                          # plan + caché caliente
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fft.power_db(x)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def benchmark(sizes=(4096, 16384, 65536, 262144), dtype=np.complex64, repeat=20):
+    return {n: {b: time_backend(b, n, dtype, repeat) for b in BACKENDS} for n in sizes}
+
+
+def fastest_backend(size, dtype=np.complex64):
+    key = (size, np.dtype(dtype).str)
+    if key not in _best:
+        times = {b: time_backend(b, size, dtype, repeat=5) for b in BACKENDS}
+        _best[key] = min(times, key=times.get)
+    return _best[key]
@@ -0,0 +1,132 @@
+# Filtros FIR en streaming: forma directa u overlap-save (convolución rápida por FFT)
+# - Espectros de filtro precalculados y cacheados por (taps, tamaño de FFT)
+# - Estado entre bloques en ambos motores: la salida no depende del tamaño de bloque
+# - Decimación opcional fusionada: en overlap-save el espectro se "pliega" antes de
+#   la IFFT, que se hace directamente del tamaño decimado
+# - make_filter() elige el motor según el número de taps (ver test_fastconv.py)
+
+from functools import lru_cache
+import numpy as np
+import scipy.fft
+import scipy.signal as sig
+from numpy.lib.stride_tricks import sliding_window_view
+
+# desde este número de taps overlap-save gana a lfilter: valor por defecto aproximado.
+# El cruce real depende del equipo y de la corrida (test_fastconv.py lo mide; se han
+# visto desde ~32 hasta ~101 taps); si importa, medirlo y pasar make_filter(crossover=...)
+FFT_CROSSOVER_TAPS = 64
+
+# ------------------------------------------
+#  CACHÉ DE ESPECTROS
+# ------------------------------------------
+
+@lru_cache(maxsize=64)
+def _taps_spectrum(taps_bytes, nfft, dtype):
+    taps = np.frombuffer(taps_bytes, dtype=dtype)
+    return scipy.fft.fft(taps, nfft)
+
+
+def filter_spectrum(taps, nfft):
+    taps = np.ascontiguousarray(taps)
+    return _taps_spectrum(taps.tobytes(), nfft, taps.dtype.str)
+
+
+def choose_nfft(ntaps, decim=1, block=None):
+    # FFT ~4-8 veces los taps (o el bloque si es menor), múltiplo de la decimación
+    target = max(8 * ntaps, 1024)
+    if block is not None:
+        target = min(target, max(block + ntaps, 2 * ntaps))
+    return decim * scipy.fft.next_fast_len(-(-target // decim))
+
+# ------------------------------------------
+#  FORMA DIRECTA
+# ------------------------------------------
+
+class DirectFilter:
+    def __init__(self, taps, decim=1):
+        self.taps = np.asarray(taps)
+        self.decim = decim
+        self._zi = None
+        self._skip = 0
+
+    def process(self, x):
+        if self._zi is None:
+            dtype = np.result_type(x.dtype, self.taps.dtype)
+            self._zi = np.zeros(len(self.taps) - 1, dtype=dtype)
+        y, self._zi = sig.lfilter(self.taps, 1.0, x, zi=self._zi)
+        if self.decim == 1:
+            return y
+        out = y[self._skip::self.decim]
+        self._skip = (self._skip - len(x)) % self.decim
+        return out
+
+# ------------------------------------------
+#  OVERLAP-SAVE
+# ------------------------------------------
+
+class OverlapSaveFilter:
+    def __init__(self, taps, decim=1, block=None, nfft=None):
+        self.taps = np.asarray(taps)
+        self.decim = decim
+        ntaps = len(self.taps)
+        # solape redondeado a múltiplo de la decimación para mantener la fase
+        self.overlap = decim * -(-(ntaps - 1) // decim)
+        self.nfft = nfft or choose_nfft(ntaps, decim, block)
+        if self.nfft % decim or self.nfft <= self.overlap:
+            raise ValueError("nfft debe ser múltiplo de decim y mayor que el solape")
+        self.step = self.nfft - self.overlap
+        self.H = filter_spectrum(self.taps, self.nfft)
+        self._shift = {}
+        self._state = None
+        self._skip = 0
+
+    def _phase_shift(self, s):
+        # desplazamiento circular de s muestras en frecuencia (para plegar con fase s)
+        if s not in self._shift:
+            k = np.arange(self.nfft)
+            self._shift[s] = np.exp(2j * np.pi * k * s / self.nfft)
+        return self._shift[s]
+
+    def process(self, x):
+        x = np.asarray(x)
+        n = len(x)
+        if self._state is None:
+            self._state = np.zeros(self.overlap, dtype=np.result_type(x.dtype, np.complex64))
+        buf = np.concatenate((self._state, x))
+        self._state = buf[len(buf) - self.overlap:]
+        if n == 0:
+            return x[:0]
+
+        nframes = -(-n // self.step)
+        pad = nframes * self.step + self.overlap - len(buf)
+        if pad:
+            buf = np.concatenate((buf, np.zeros(pad, dtype=buf.dtype)))
+        frames = sliding_window_view(buf, self.nfft)[::self.step][:nframes]
+
+        Y = scipy.fft.fft(frames, axis=1)
+        Y *= self.H
+
+        if self.decim == 1:
+            y = scipy.fft.ifft(Y, axis=1)[:, self.overlap:].ravel()[:n]
+        else:
+            d, s = self.decim, self._skip
+            if s:
+                Y *= self._phase_shift(s)
+            # plegado: y[mD + s] = IFFT_{N/D}(sum de los D alias) / D
+            Yf = Y.reshape(nframes, d, self.nfft // d).sum(axis=1)
+            y = scipy.fft.ifft(Yf, axis=1)[:, self.overlap // d:].ravel() / d
+            y = y[:len(range(s, n, d))]
+            self._skip = (s - n) % d
+
+        if not np.iscomplexobj(x) and not np.iscomplexobj(self.taps):
+            y = y.real
+        return y.astype(np.result_type(x.dtype, self.taps.dtype), copy=False)
+
+# ------------------------------------------
+#  SELECCIÓN AUTOMÁTICA
+# ------------------------------------------
+
+def make_filter(taps, decim=1, block=None, crossover=FFT_CROSSOVER_TAPS):
+    if len(taps) >= crossover:
+        return OverlapSaveFilter(taps, decim, block)
+    return DirectFilter(taps, decim)
@@ -0,0 +1,24 @@
+# Kernels numba compartidos
+# cache=True: la compilación se guarda en __pycache__ y los arranques
+# siguientes sólo cargan el código máquina.
+# nogil=True: el kernel libera el GIL y puede correr en paralelo con otros hilos.
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def fm_demod(iq):
+    out = np.empty(len(iq)-1, dtype=np.float32)
+    for i in range(len(iq)-1):
+        z = iq[i+1] * np.conj(iq[i])
+        out[i] = np.arctan2(z.imag, z.real)
+    return out
+
+
+def warm():
+    # fuerza compilación (o carga desde caché) con el tipo que entrega read_samples
+    # y con complex64 (fm_receiver_pipeline convierte read_bytes con una LUT)
+    fm_demod(np.zeros(2, dtype=np.complex128))
+    fm_demod(np.zeros(2, dtype=np.complex64))
+    return fm_demod
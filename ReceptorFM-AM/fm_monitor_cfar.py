@@ -0,0 +1,66 @@
+import sys
+import json
+import time
+import numpy as np
+from rtlsdr import RtlSdr
+
+from fm_cfar import OccupancyDetector
+
+# ------------------------------------------
+#  MONITOR DE OCUPACIÓN / INTERFERENCIAS
+# ------------------------------------------
+# Uso: python fm_monitor_cfar.py [frecuencia_MHz] [archivo.jsonl]
+# Sólo se guardan eventos start/stop (una línea JSON por evento), no espectros.
+
+FFT_SIZE = 16384
+AVG = 8          # FFTs promediadas por cuadro
+
+
+def main():
+    center = float(sys.argv[1]) * 1e6 if len(sys.argv) > 1 else 100e6
+    log_path = sys.argv[2] if len(sys.argv) > 2 else "ocupacion.jsonl"
+
+    sdr = RtlSdr()
+    sdr.sample_rate = 2.4e6
+    sdr.center_freq = center
+    sdr.gain = 30
+
+    window = np.hanning(FFT_SIZE).astype(np.float32)
+    det = OccupancyDetector(center, sdr.sample_rate, FFT_SIZE)
+
+    print(f"📡 Monitoreando {center/1e6:.3f} MHz ±{sdr.sample_rate/2e6:.1f} MHz → {log_path}")
+    print("   CTRL+C para salir")
+
+    n_frames = 0
+    t_cpu = 0.0
+    with open(log_path, "a", buffering=1) as log:
+        try:
+            while True:
+                samples = sdr.read_samples(FFT_SIZE * AVG)
+
+                t0 = time.perf_counter()
+                x = samples.reshape(AVG, FFT_SIZE) * window
+                X = np.fft.fftshift(np.fft.fft(x, axis=1), axes=1)
+                power = np.mean(np.abs(X) ** 2, axis=0)
+
+                events = det.process(power)
+                t_cpu += time.perf_counter() - t0
+                n_frames += 1
+
+                for e in events:
+                    log.write(json.dumps(e) + "\n")
+                    icon = "🟢" if e["type"] == "start" else "🔴"
+                    print(f"{icon} {e['type']:5s} {e['freq']/1e6:9.4f} MHz  "
+                          f"bw={e['bandwidth']/1e3:6.1f} kHz  pico={e['peak_db']:5.1f} dB  "
+                          f"dur={e['duration']:.1f}s")
+
+        except KeyboardInterrupt:
+            for e in det.tracker.flush():
+                log.write(json.dumps(e) + "\n")
+            print(f"\n⏹  {n_frames} cuadros, {t_cpu / max(n_frames, 1) * 1000:.1f} ms CPU/cuadro")
+
+        finally:
+            sdr.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# Pipeline por etapas en hilos para un solo dispositivo
+# - Cada etapa (filtro, demod, resampleo, ...) corre en su propio hilo; NumPy/SciPy
+#   y los kernels numba con nogil=True liberan el GIL, así que varios núcleos
+#   trabajan a la vez sobre bloques consecutivos
+# - Colas acotadas entre etapas: si una etapa se atrasa, las anteriores esperan
+#   (contrapresión) en vez de acumular memoria
+# - BlockPool: buffers preasignados que se reciclan; una etapa con pool escribe en
+#   `out` en vez de crear un arreglo nuevo por bloque
+# - report(): utilización de cada etapa (tiempo ocupado / tiempo total); la más
+#   alta es el cuello de botella
+
+import time
+import queue
+import threading
+import numpy as np
+
+_STOP = object()
+
+# ------------------------------------------
+#  POOL DE BLOQUES
+# ------------------------------------------
+
+class BlockPool:
+    def __init__(self, shape, dtype, count):
+        self.shape = shape
+        self.dtype = np.dtype(dtype)
+        self._free = queue.Queue()
+        for _ in range(count):
+            self._free.put(np.empty(shape, dtype=dtype))
+        self.count = count
+        self.waits = 0          # veces que no había buffer libre
+
+    def acquire(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            self.waits += 1
+            return self._free.get()
+
+    def release(self, buf):
+        self._free.put(buf)
+
+# ------------------------------------------
+#  ETAPAS
+# ------------------------------------------
+
+class Stage:
+    # fn(x) -> y, o fn(x, out) -> y si hay pool (y puede ser una vista de out)
+    def __init__(self, name, fn, pool=None):
+        self.name = name
+        self.fn = fn
+        self.pool = pool
+        self.blocks = 0
+        self.busy = 0.0
+        self.max_queue = 0
+
+    def stats(self, elapsed):
+        return {"name": self.name, "blocks": self.blocks,
+                "util": self.busy / elapsed if elapsed > 0 else 0.0,
+                "ms_per_block": self.busy / self.blocks * 1000 if self.blocks else 0.0,
+                "max_queue": self.max_queue,
+                "pool_waits": self.pool.waits if self.pool else 0}
+
+# ------------------------------------------
+#  PIPELINE
+# ------------------------------------------
+
+class Pipeline:
+    def __init__(self, source, stages, sink=None, depth=4):
+        # source: Stage cuyo fn(out) devuelve un bloque o None al terminar
+        # sink: función final (en su propio hilo) que consume la salida
+        self.source = source
+        self.stages = list(stages)
+        self.sink = Stage("sink", sink) if sink is not None else None
+        self.depth = depth
+        self.error = None
+        self._running = False
+        self._threads = []
+        self._t0 = self._t1 = None
+
+    def _all(self):
+        return [self.source] + self.stages + ([self.sink] if self.sink else [])
+
+    def start(self):
+        stages = self._all()
+        queues = [queue.Queue(maxsize=self.depth) for _ in stages[1:]]
+        self._running = True
+        self._t0 = time.perf_counter()
+        self._t1 = None
+        self._threads = [threading.Thread(target=self._run_source, args=(queues[0],),
+                                          name="pipe-source", daemon=True)]
+        for i, st in enumerate(stages[1:]):
+            q_out = queues[i + 1] if i + 1 < len(queues) else None
+            self._threads.append(threading.Thread(target=self._run_stage, args=(st, queues[i], q_out),
+                                                  name=f"pipe-{st.name}", daemon=True))
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self):
+        # la fuente deja de leer; los bloques en vuelo terminan de procesarse
+        self._running = False
+
+    def join(self, timeout=None):
+        for t in self._threads:
+            t.join(timeout)
+        if self._t1 is None:
+            self._t1 = time.perf_counter()
+        if self.error is not None:
+            raise self.error
+
+    def run(self, duration=None):
+        self.start()
+        try:
+            if duration is not None:
+                time.sleep(duration)
+                self.stop()
+            self.join()
+        except KeyboardInterrupt:
+            self.stop()
+            self.join()
+        return self.report()
+
+    def _fail(self, e):
+        if self.error is None:
+            self.error = e
+        self._running = False
+
+    def _run_source(self, q_out):
+        st = self.source
+        try:
+            while self._running:
+                out = st.pool.acquire() if st.pool else None
+                t0 = time.perf_counter()
+                y = st.fn(out) if st.pool else st.fn()
+                st.busy += time.perf_counter() - t0
+                if y is None:
+                    break
+                st.blocks += 1
+                q_out.put((y, [(st.pool, out)] if st.pool else []))
+        except Exception as e:
+            self._fail(e)
+        q_out.put(_STOP)
+
+    def _run_stage(self, st, q_in, q_out):
+        while True:
+            item = q_in.get()
+            if item is _STOP:
+                break
+            st.max_queue = max(st.max_queue, q_in.qsize() + 1)
+            x, held = item
+            if self.error is not None:
+                self._release(held)
+                continue
+            try:
+                out = st.pool.acquire() if st.pool else None
+                t0 = time.perf_counter()
+                y = st.fn(x, out) if st.pool else st.fn(x)
+                st.busy += time.perf_counter() - t0
+                st.blocks += 1
+            except Exception as e:
+                self._fail(e)
+                self._release(held)
+                continue
+
+            # los buffers de entrada vuelven al pool salvo que la salida sea una vista de ellos
+            if y is not None and any(np.may_share_memory(y, b) for _, b in held):
+                keep = held
+            else:
+                self._release(held)
+                keep = []
+            if st.pool:
+                keep = keep + [(st.pool, out)]
+
+            if q_out is None or y is None:
+                self._release(keep)
+            else:
+                q_out.put((y, keep))
+        if q_out is not None:
+            q_out.put(_STOP)
+        self._t1 = time.perf_counter()
+
+    @staticmethod
+    def _release(held):
+        for pool, buf in held:
+            pool.release(buf)
+
+    def report(self):
+        end = self._t1 if self._t1 is not None else time.perf_counter()
+        elapsed = end - self._t0
+        return [st.stats(elapsed) for st in self._all()]
+
+
+def print_report(report, block_seconds=None):
+    worst = max(report, key=lambda r: r["util"])
+    print(f"\n{'etapa':12s} {'bloques':>8s} {'ms/bloque':>10s} {'utiliz.':>8s} {'cola máx':>9s}")
+    for r in report:
+        flag = "  🐢 cuello de botella" if r is worst else ""
+        print(f"{r['name']:12s} {r['blocks']:8d} {r['ms_per_block']:10.2f} {r['util']*100:7.0f}% "
+              f"{r['max_queue']:9d}{flag}")
+    if block_seconds:
+        rt = block_seconds * 1000 / worst["ms_per_block"] if worst["ms_per_block"] else float("inf")
+        print(f"   la etapa más lenta procesa {rt:.1f}× tiempo real")
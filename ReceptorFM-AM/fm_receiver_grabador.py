@@ -0,0 +1,96 @@
+import sys
+import numpy as np
+from rtlsdr import RtlSdr
+import sounddevice as sd
+import scipy.signal as sig
+
+from fm_recorder import Recorder
+
+# ------------------------------------------
+#  FM DEMODULATOR
+# ------------------------------------------
+def fm_demod(iq):
+    return np.angle(iq[1:] * np.conj(iq[:-1]))
+
+# ------------------------------------------
+#  DE-EMPHASIS (75us)
+# ------------------------------------------
+def deemphasis(audio, fs=48000):
+    tau = 75e-6
+    a = np.exp(-1/(fs*tau))
+    b = [1 - a]
+    a = [1, -a]
+    return sig.lfilter(b, a, audio)
+
+# ------------------------------------------
+#  MAIN RECEPTOR + GRABACIÓN
+# ------------------------------------------
+# Uso: python fm_receiver_grabador.py [--iq]
+#   --iq  además del audio graba el IQ filtrado del canal (256 kS/s, .cf32 + .json)
+
+def main():
+
+    sdr = RtlSdr()
+    sdr.sample_rate = 1.024e6
+    sdr.center_freq = 107.1e6
+    sdr.gain = 40
+
+    BLOCK = 128 * 1024
+    AUDIO_RATE = 48000
+    IQ_DECIM = 4
+
+    # filtro de canal ±100 kHz, con estado entre bloques
+    lpf = sig.firwin(101, cutoff=100e3, fs=sdr.sample_rate)
+    zi = np.zeros(len(lpf) - 1, dtype=np.complex128)
+
+    rec = Recorder(audio_rate=AUDIO_RATE,
+                   iq_rate=sdr.sample_rate / IQ_DECIM if "--iq" in sys.argv else None,
+                   center_freq=sdr.center_freq)
+
+    stream = sd.OutputStream(
+        samplerate=AUDIO_RATE,
+        channels=1,
+        dtype='float32',
+        blocksize=1024,
+        latency='low'
+    )
+    stream.start()
+
+    print("🎙  Recibiendo y grabando FM… CTRL+C para salir")
+
+    n = 0
+    try:
+        while True:
+            samples = sdr.read_samples(BLOCK)
+
+            channel, zi = sig.lfilter(lpf, 1.0, samples, zi=zi)
+            rec.write_iq(channel[::IQ_DECIM])
+
+            demod = fm_demod(channel)
+            audio = sig.resample_poly(demod, up=3, down=64)
+            audio = deemphasis(audio, AUDIO_RATE)
+
+            m = np.max(np.abs(audio))
+            if m > 0:
+                audio = audio / m * 0.8
+            audio = audio.astype(np.float32)
+
+            # la grabación nunca bloquea este bucle
+            rec.write_audio(audio)
+
+            for i in range(0, len(audio), 1024):
+                stream.write(audio[i:i+1024])
+
+            n += 1
+            if n % 100 == 0:
+                print("📼", rec.report())
+    except KeyboardInterrupt:
+        pass
+
+    rec.close()
+    print("📼", rec.report())
+    sdr.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,24 @@
 # - Frequency, sample_rate and gain controls
 # - Real-time FFT (spectrum) and waterfall (spectrogram)
 # - FM demodulation and audio playback
+# - Bounded worker->GUI delivery with display lag / queue depth / drop counters
+# - Zoom-FFT: click the spectrum to get a high-resolution view of a sub-band
+#   (mixed/decimated in streaming alongside the wideband view, see fm_zoom.py)
+# - --publicar: also serve the spectrum to remote viewers (fm_spectrum_server.py)
 # Notes: Ensure librtlsdr is installed and accessible (librtlsdr.dll on Windows).
+# Startup: scipy.signal, sounddevice and rtlsdr are not imported at module load;
+# they are warmed in background threads once the window is up (see fm_startup.py).
 
 import sys
 import time
-import numpy as np
+import threading
 from collections import deque
-from rtlsdr import RtlSdr
-import sounddevice as sd
-from scipy.signal import butter, lfilter, decimate
+import numpy as np
+
+from fm_startup import BENCH, LazyModule, Warmup, mark
+
+sig = LazyModule("scipy.signal")
+sd = LazyModule("sounddevice")
 
 from PyQt5.QtCore import QThread, pyqtSignal, QTimer
 from PyQt5.QtWidgets import (
@@ -27,14 +36,14 @@ from matplotlib.figure import Figure
 # DSP helpers
 # -----------------------
 
-def bandpass(sig, lowcut, highcut, fs, order=5):
-    b, a = butter(order, [lowcut/(fs/2), highcut/(fs/2)], btype='band')
-    return lfilter(b, a, sig)
+def bandpass(x, lowcut, highcut, fs, order=5):
+    b, a = sig.butter(order, [lowcut/(fs/2), highcut/(fs/2)], btype='band')
+    return sig.lfilter(b, a, x)
 
 
-def lowpass(sig, cutoff, fs, order=5):
-    b, a = butter(order, cutoff/(fs/2), btype='low')
-    return lfilter(b, a, sig)
+def lowpass(x, cutoff, fs, order=5):
+    b, a = sig.butter(order, cutoff/(fs/2), btype='low')
+    return sig.lfilter(b, a, x)
 
 
 def fm_demod(iq):
@@ -48,16 +57,70 @@ def deemphasis_filter(audio, fs):
     alpha = fs * tau
     b = [1]
     a = [alpha + 1, -alpha]
-    return lfilter(b, a, audio)
+    return sig.lfilter(b, a, audio)
+
+# -----------------------
+# Worker -> GUI delivery
+# -----------------------
+# The worker never emits arrays through queued Qt signals: if painting is slower
+# than capture the Qt event queue would grow without bound. Visual data goes to
+# a latest-value Mailbox (overwrites, counts drops) and waterfall rows / audio to
+# BoundedChannels; the GUI pulls from them on its own timers.
+
+class Mailbox:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._item = None
+        self.puts = 0
+        self.drops = 0
+
+    def put(self, value):
+        with self._lock:
+            if self._item is not None:
+                self.drops += 1
+            self._item = (value, time.monotonic())
+            self.puts += 1
+
+    def take(self):
+        # returns (value, capture_time) or None
+        with self._lock:
+            item, self._item = self._item, None
+        return item
+
+
+class BoundedChannel:
+    def __init__(self, maxlen):
+        self._lock = threading.Lock()
+        self._items = deque(maxlen=maxlen)
+        self.maxlen = maxlen
+        self.puts = 0
+        self.drops = 0
+
+    def put(self, value):
+        with self._lock:
+            if len(self._items) == self.maxlen:
+                self.drops += 1    # oldest item is overwritten
+            self._items.append((value, time.monotonic()))
+            self.puts += 1
+
+    def get(self):
+        with self._lock:
+            return self._items.popleft() if self._items else None
+
+    def drain(self):
+        with self._lock:
+            items = list(self._items)
+            self._items.clear()
+        return items
+
+    def __len__(self):
+        return len(self._items)
 
 # -----------------------
 # SDR Worker Thread
 # -----------------------
 
 class SDRWorker(QThread):
-    spectrum_ready = pyqtSignal(np.ndarray)
-    waterfall_ready = pyqtSignal(np.ndarray)
-    audio_ready = pyqtSignal(np.ndarray)
     status = pyqtSignal(str)
 
     def __init__(self, center_freq=107.7e6, sample_rate=2.4e6, gain='auto', fft_size=16384, waterfall_rows=256, parent=None):
@@ -70,8 +133,13 @@ class SDRWorker(QThread):
         self._running = False
         self.sdr = None
 
-        # waterfall buffer: will emit the whole image occasionally
-        self.waterfall = np.zeros((self.waterfall_rows, int(self.fft_size/2)), dtype=np.float32)
+        # outputs pulled by the GUI (bounded, memory stays flat)
+        self.spectrum = Mailbox()
+        self.waterfall = BoundedChannel(waterfall_rows)
+        self.audio = BoundedChannel(8)
+        self.zoom = Mailbox()
+        self._zoom_request = None    # (offset Hz, span Hz) or None
+        self.spectrum_tap = None     # callable(full-span power dB), e.g. SpectrumServer.publish
 
     def configure(self, center_freq=None, sample_rate=None, gain=None):
         if center_freq is not None:
@@ -81,11 +149,19 @@ class SDRWorker(QThread):
         if gain is not None:
             self.gain = gain
 
+    def set_zoom(self, offset, span):
+        # picked up by the worker loop on its next block
+        self._zoom_request = (offset, span)
+
+    def clear_zoom(self):
+        self._zoom_request = None
+
     def stop(self):
         self._running = False
 
     def run(self):
         try:
+            from rtlsdr import RtlSdr
             self.sdr = RtlSdr()
             self.sdr.sample_rate = self.sample_rate
             self.sdr.center_freq = self.center_freq
@@ -100,7 +176,10 @@ class SDRWorker(QThread):
         # chunk size chosen to be manageable memory-wise
         chunk = 256 * 1024
         fft_n = self.fft_size
-        window = np.hanning(fft_n)
+        # cached window/plan, preallocated buffers, fastest backend on this host (fm_fft.py)
+        from fm_fft import FFTProvider
+        fft = FFTProvider(fft_n)
+        zoom, zoom_cfg = None, None
 
         while self._running:
             try:
@@ -109,30 +188,37 @@ class SDRWorker(QThread):
                 self.status.emit(f"Read error: {e}")
                 break
 
+            # zoom sees every sample (streaming state), not just the displayed frame
+            if self._zoom_request != zoom_cfg:
+                zoom_cfg = self._zoom_request
+                zoom = None
+                if zoom_cfg is not None:
+                    from fm_zoom import ZoomFFT
+                    zoom = ZoomFFT(self.sample_rate, *zoom_cfg, block=chunk)
+                    self.status.emit(f"Zoom {zoom.span/1e3:.1f} kHz @ {zoom_cfg[0]/1e3:+.1f} kHz, "
+                                     f"{zoom.resolution:.1f} Hz/bin")
+            if zoom is not None:
+                for zspec in zoom.process(samples):
+                    self.zoom.put((zoom.freqs, zspec))
+
             # pick last fft_n for spectrum to stay responsive
             if len(samples) < fft_n:
                 continue
 
             frame = samples[-fft_n:]
 
-            # compute FFT (power)
-            spec = np.fft.fftshift(np.fft.fft(frame * window))
-            power = 20 * np.log10(np.abs(spec) + 1e-12)
+            # compute FFT (power, already centered; reused buffer)
+            power = fft.power_db(frame)
+            if self.spectrum_tap is not None:
+                self.spectrum_tap(power)
             half = power[int(len(power)/2):]  # positive frequencies
 
             # normalize for display
             pnorm = (half - np.max(half))
-            self.spectrum_ready.emit(pnorm)
-
-            # update waterfall by rolling and placing newest row
-            row = np.copy(pnorm)
-            self.waterfall = np.roll(self.waterfall, -1, axis=0)
-            # resize/trim row to fit if necessary
-            if row.shape[0] != self.waterfall.shape[1]:
-                # interpolate or trim
-                row = np.interp(np.linspace(0, len(row)-1, self.waterfall.shape[1]), np.arange(len(row)), row)
-            self.waterfall[-1, :] = row
-            self.waterfall_ready.emit(self.waterfall)
+            self.spectrum.put(pnorm)
+
+            # newest waterfall row; the GUI keeps the image
+            self.waterfall.put(pnorm.astype(np.float32))
 
             # FM audio path: demodulate portion around center
             try:
@@ -147,7 +233,7 @@ class SDRWorker(QThread):
                 decim_factor = int(self.sample_rate / 240000)  # to 240k
                 if decim_factor < 1:
                     decim_factor = 1
-                audio1 = decimate(audio_lp, decim_factor)
+                audio1 = sig.decimate(audio_lp, decim_factor)
 
                 # apply deemphasis
                 fs1 = int(self.sample_rate / decim_factor)
@@ -155,7 +241,7 @@ class SDRWorker(QThread):
 
                 # final decimation to 48k
                 final_factor = max(1, int(fs1 / 48000))
-                audio_final = decimate(audio1, final_factor)
+                audio_final = sig.decimate(audio1, final_factor)
 
                 # normalize
                 if np.max(np.abs(audio_final)) > 0:
@@ -163,8 +249,8 @@ class SDRWorker(QThread):
                 # convert to float32
                 audio_final = audio_final.astype(np.float32)
 
-                # emit audio
-                self.audio_ready.emit(audio_final)
+                # hand audio to the GUI (oldest block dropped if it falls behind)
+                self.audio.put(audio_final)
             except Exception as e:
                 # non-fatal for visualization
                 self.status.emit(f"Audio pipeline error: {e}")
@@ -201,9 +287,6 @@ class MainWindow(QMainWindow):
 
         # SDR worker
         self.worker = SDRWorker(center_freq=self.center_freq, sample_rate=self.sample_rate, gain=self.gain)
-        self.worker.spectrum_ready.connect(self.update_spectrum)
-        self.worker.waterfall_ready.connect(self.update_waterfall)
-        self.worker.audio_ready.connect(self.play_audio)
         self.worker.status.connect(self.on_status)
 
         # UI elements
@@ -237,6 +320,13 @@ class MainWindow(QMainWindow):
         self.stop_btn.setEnabled(False)
         controls.addWidget(self.stop_btn)
 
+        controls.addWidget(QLabel("Zoom span:"))
+        self.zoom_combo = QComboBox()
+        self.zoom_combo.addItems(["off", "200 kHz", "50 kHz", "10 kHz"])
+        self.zoom_combo.currentIndexChanged.connect(self.apply_zoom)
+        controls.addWidget(self.zoom_combo)
+        self.zoom_offset = 0.0
+
         main_layout.addLayout(controls)
 
         plots = QHBoxLayout()
@@ -246,24 +336,44 @@ class MainWindow(QMainWindow):
         self.spec_line, = self.spec_canvas.ax.plot([], [])
         self.spec_canvas.ax.set_title("Spectrum (dB)")
         self.spec_canvas.ax.set_xlabel("Frequency bin")
+        self.spec_canvas.mpl_connect("button_press_event", self.on_spectrum_click)
         plots.addWidget(self.spec_canvas)
 
         # Waterfall
         self.wf_canvas = MplCanvas(self, width=5, height=3)
-        self.wf_im = self.wf_canvas.ax.imshow(np.zeros((256, int(self.worker.fft_size/2))), aspect='auto', origin='lower')
+        self.wf_data = np.zeros((self.worker.waterfall_rows, int(self.worker.fft_size/2)), dtype=np.float32)
+        self.wf_pos = 0
+        self.wf_im = self.wf_canvas.ax.imshow(self.wf_data, aspect='auto', origin='lower')
         self.wf_canvas.ax.set_title("Waterfall")
         plots.addWidget(self.wf_canvas)
 
         main_layout.addLayout(plots)
 
+        # Zoom spectrum (hidden until a span is selected)
+        self.zoom_canvas = MplCanvas(self, width=10, height=2)
+        self.zoom_line, = self.zoom_canvas.ax.plot([], [])
+        self.zoom_canvas.ax.set_xlabel("Offset from center (kHz)")
+        self.zoom_canvas.setVisible(False)
+        main_layout.addWidget(self.zoom_canvas)
+
         # status
         self.status_label = QLabel("Ready")
         main_layout.addWidget(self.status_label)
 
+        # delivery health: display lag, audio queue depth, drops
+        self.stats_label = QLabel("")
+        main_layout.addWidget(self.stats_label)
+        self.display_lag = 0.0
+        self.audio_lag = 0.0
+
         central.setLayout(main_layout)
 
-        # audio playback queue
-        self.audio_queue = deque()
+        # display refresh: pull latest spectrum / pending waterfall rows at a fixed rate
+        self.display_timer = QTimer()
+        self.display_timer.setInterval(50)  # ms
+        self.display_timer.timeout.connect(self.refresh_display)
+
+        # audio playback pulls from the worker's bounded channel
         self.audio_timer = QTimer()
         self.audio_timer.setInterval(200)  # ms
         self.audio_timer.timeout.connect(self.audio_playback_loop)
@@ -288,6 +398,7 @@ class MainWindow(QMainWindow):
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         self.audio_timer.start()
+        self.display_timer.start()
         self.status_label.setText("Running")
 
     def on_stop(self):
@@ -295,6 +406,7 @@ class MainWindow(QMainWindow):
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.audio_timer.stop()
+        self.display_timer.stop()
         self.status_label.setText("Stopped")
 
     def update_spectrum(self, spec):
@@ -304,21 +416,76 @@ class MainWindow(QMainWindow):
         self.spec_canvas.ax.autoscale_view()
         self.spec_canvas.draw()
 
-    def update_waterfall(self, wf):
-        # update image
-        self.wf_im.set_data(wf)
+    def on_spectrum_click(self, event):
+        # spectrum shows the positive half: bin -> offset from center
+        if event.xdata is None:
+            return
+        self.zoom_offset = event.xdata * self.sample_rate / self.worker.fft_size
+        if self.zoom_combo.currentText() == "off":
+            self.zoom_combo.setCurrentIndex(1)    # triggers apply_zoom
+        else:
+            self.apply_zoom()
+
+    def apply_zoom(self):
+        text = self.zoom_combo.currentText()
+        if text == "off":
+            self.worker.clear_zoom()
+            self.zoom_canvas.setVisible(False)
+            return
+        span = float(text.split()[0]) * 1e3
+        self.worker.set_zoom(self.zoom_offset, span)
+        self.zoom_canvas.ax.set_title(f"Zoom {span/1e3:.0f} kHz @ "
+                                      f"{(self.center_freq + self.zoom_offset)/1e6:.4f} MHz")
+        self.zoom_canvas.setVisible(True)
+
+    def update_zoom(self, freqs, spec):
+        self.zoom_line.set_data(freqs / 1e3, spec)
+        self.zoom_canvas.ax.relim()
+        self.zoom_canvas.ax.autoscale_view()
+        self.zoom_canvas.draw()
+
+    def update_waterfall(self, rows):
+        # write new rows into the ring, show it oldest -> newest
+        cols = self.wf_data.shape[1]
+        for row in rows[-self.wf_data.shape[0]:]:
+            if row.shape[0] != cols:
+                row = np.interp(np.linspace(0, len(row)-1, cols), np.arange(len(row)), row)
+            self.wf_data[self.wf_pos, :] = row
+            self.wf_pos = (self.wf_pos + 1) % self.wf_data.shape[0]
+        self.wf_im.set_data(np.roll(self.wf_data, -self.wf_pos, axis=0))
         self.wf_canvas.draw()
 
-    def play_audio(self, audio):
-        # enqueue audio buffer
-        self.audio_queue.append(audio)
+    def refresh_display(self):
+        item = self.worker.spectrum.take()
+        if item is not None:
+            spec, stamp = item
+            self.update_spectrum(spec)
+            self.display_lag = time.monotonic() - stamp
+
+        item = self.worker.zoom.take()
+        if item is not None and self.zoom_canvas.isVisible():
+            (freqs, zspec), _ = item
+            self.update_zoom(freqs, zspec)
+
+        rows = self.worker.waterfall.drain()
+        if rows:
+            self.update_waterfall([r for r, _ in rows])
+
+        w = self.worker
+        self.stats_label.setText(
+            f"display lag {self.display_lag*1000:.0f} ms | audio lag {self.audio_lag*1000:.0f} ms | "
+            f"audio queue {len(w.audio)}/{w.audio.maxlen} | "
+            f"dropped: spectrum {w.spectrum.drops}, waterfall {w.waterfall.drops}, audio {w.audio.drops}")
 
     def audio_playback_loop(self):
-        if not self.audio_queue:
+        item = self.worker.audio.get()
+        if item is None:
             return
-        buffer = self.audio_queue.popleft()
+        buffer, stamp = item
+        self.audio_lag = time.monotonic() - stamp
         try:
             sd.play(buffer, 48000, blocking=False)
+            mark("first_audio")
         except Exception as e:
             self.status_label.setText(f"Audio error: {e}")
 
@@ -332,6 +499,17 @@ class MainWindow(QMainWindow):
 def main():
     app = QApplication(sys.argv)
     win = MainWindow()
+    if "--publicar" in sys.argv:
+        # remote viewers at http://host:8001/ (rows quantized/encoded once per view)
+        from fm_spectrum_server import SpectrumServer
+        win.worker.spectrum_tap = SpectrumServer(db_min=0.0, db_max=90.0).run_in_thread().publish
+    # first event-loop iteration = window painted; then warm the heavy modules
+    QTimer.singleShot(0, lambda: mark("window"))
+    win.warmup = Warmup()
+    QTimer.singleShot(0, lambda: win.warmup.start_import("scipy.signal", "sounddevice", "rtlsdr"))
+    if BENCH:
+        # startup benchmark: press Start automatically to measure time-to-first-audio
+        QTimer.singleShot(0, win.on_start)
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
@@ -0,0 +1,116 @@
+import sys
+from fractions import Fraction
+import numpy as np
+import scipy.signal as sig
+
+from fm_filters import make_filter
+from fm_pipeline import BlockPool, Pipeline, Stage, print_report
+from fm_autotune import load_config
+
+# ------------------------------------------
+#  RECEPTOR FM EN PIPELINE (una etapa por hilo)
+# ------------------------------------------
+# captura → filtro de canal → demod (numba, nogil) → audio 48k → normalización → salida
+# Uso: python fm_receiver_pipeline.py [frecuencia_MHz] [discriminador]
+#   discriminador: atan_poly9 (por defecto), exacto_numba, atan_poly3, cuadratura
+#   (ver fm_discriminators.py / test_discriminators.py: atan_poly9 es ~15× más rápido
+#   que exacto_numba con 93.6 dB de SNR sin ruido, el mismo SNR que el exacto a CNR 20)
+# Al salir (CTRL+C) se imprime la utilización de cada etapa.
+
+SAMPLE_RATE = 1.024e6
+AUDIO_RATE = 48000
+BLOCK = 128 * 1024
+DEPTH = 4
+DISCRIMINATOR = "atan_poly9"
+
+# pares I/Q uint8 (little endian: I + 256·Q) → complex64, sin pasar por complex128
+_v = np.arange(65536)
+IQ_LUT = (((_v & 0xFF) - 127.5) / 127.5 + 1j * ((_v >> 8) - 127.5) / 127.5).astype(np.complex64)
+
+
+def deemphasis_coeffs(fs=AUDIO_RATE):
+    tau = 75e-6
+    a = np.exp(-1/(fs*tau))
+    return [1 - a], [1, -a]
+
+
+def audio_ratio(sample_rate):
+    # remuestreo a 48 kHz: 3/64 a 1.024 MS/s, 1/50 a 2.4 MS/s
+    ratio = Fraction(AUDIO_RATE, int(sample_rate))
+    return ratio.numerator, ratio.denominator
+
+
+def build_stages(fm_demod, sample_rate=SAMPLE_RATE, block=BLOCK, depth=DEPTH):
+    # etapas de procesamiento (sin fuente ni salida); cada una guarda su estado
+    lpf = make_filter(sig.firwin(101, cutoff=200e3, fs=sample_rate), block=block)
+    up, down = audio_ratio(sample_rate)
+    b, a = deemphasis_coeffs()
+    zi = {"de": np.zeros(1)}
+
+    def audio(x):
+        y = sig.resample_poly(x, up=up, down=down)
+        y, zi["de"] = sig.lfilter(b, a, y, zi=zi["de"])
+        return y
+
+    def normalize(x, out):
+        y = out[:len(x)]
+        m = np.max(np.abs(x))
+        np.multiply(x, 0.8 / m if m > 0 else 0.0, out=y, casting="unsafe")
+        return y
+
+    n_audio = block * up // down + 1
+    return [
+        Stage("filtro", lpf.process),
+        Stage("demod", fm_demod),
+        Stage("audio", audio),
+        Stage("normaliza", normalize, BlockPool(n_audio, np.float32, depth + 2)),
+    ]
+
+
+def main():
+    from rtlsdr import RtlSdr
+    import sounddevice as sd
+    import fm_discriminators
+
+    sdr = RtlSdr()
+    sdr.sample_rate = SAMPLE_RATE
+    sdr.center_freq = float(sys.argv[1]) * 1e6 if len(sys.argv) > 1 else 107.1e6
+    sdr.gain = 40
+
+    # bloque / profundidad de cola calibrados con fm_autotune.py
+    cfg = load_config(SAMPLE_RATE, {"block": BLOCK, "depth": DEPTH, "audio_frame": 1024})
+    block, depth = cfg["block"], cfg["depth"]
+
+    fm_discriminators.warm()
+    demod = fm_discriminators.get_discriminator(sys.argv[2] if len(sys.argv) > 2 else DISCRIMINATOR)
+
+    stream = sd.OutputStream(
+        samplerate=AUDIO_RATE,
+        channels=1,
+        dtype='float32',
+        blocksize=cfg["audio_frame"],
+        latency='low'
+    )
+    stream.start()
+
+    def capture(out):
+        raw = sdr.read_bytes(2 * block)
+        np.take(IQ_LUT, np.frombuffer(raw, dtype=np.uint16), out=out)
+        return out
+
+    pipe = Pipeline(
+        Stage("captura", capture, BlockPool(block, np.complex64, depth + 2)),
+        build_stages(demod, SAMPLE_RATE, block, depth),
+        sink=stream.write,
+        depth=depth,
+    )
+
+    print("🎧 Receptor FM en pipeline… CTRL+C para salir")
+    report = pipe.run()
+    print_report(report, block / SAMPLE_RATE)
+
+    stream.stop()
+    sdr.close()
+
+if __name__ == "__main__":
+    main()
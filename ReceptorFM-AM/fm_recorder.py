@@ -0,0 +1,218 @@
+# Grabador en segundo plano para los receptores FM
+# - El bucle de captura sólo hace put_nowait() en una cola acotada: nunca se bloquea
+# - Si la cola está llena el bloque se descarta y se cuenta (no se pierden muestras RF)
+# - Un hilo dedicado escribe con buffers grandes:
+#     audio → segmentos WAV int16
+#     IQ    → segmentos .cf32 (complex64 crudo) + metadatos .json
+# - Los segmentos rotan por tamaño o por tiempo
+# - Un error de escritura (disco lleno, rotación fallida) se cuenta y el bloque se
+#   pierde; el hilo sigue vivo y el siguiente bloque abre un segmento nuevo
+
+import os
+import json
+import time
+import wave
+import queue
+import threading
+import numpy as np
+
+WRITE_BUFFER = 4 * 1024 * 1024
+
+# ------------------------------------------
+#  SEGMENTOS
+# ------------------------------------------
+
+class _Segment:
+    def __init__(self, directory, prefix, ext, max_bytes, max_seconds):
+        self.directory = directory
+        self.prefix = prefix
+        self.ext = ext
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.index = 0
+        self.file = None
+        self.path = None
+        self.bytes = 0
+        self.opened_at = 0.0
+
+    def due(self, now):
+        return (self.file is None or self.bytes >= self.max_bytes
+                or now - self.opened_at >= self.max_seconds)
+
+    def open(self, now):
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
+        self.path = os.path.join(self.directory, f"{self.prefix}_{stamp}_{self.index:03d}{self.ext}")
+        self.index += 1
+        self.bytes = 0
+        self.opened_at = now
+        self.file = open(self.path, "wb", buffering=WRITE_BUFFER)
+        return self.file
+
+    def close(self):
+        if self.file is not None:
+            try:
+                self.file.close()
+            finally:
+                self.file = None
+
+
+class _WavSegment(_Segment):
+    def __init__(self, directory, prefix, rate, max_bytes, max_seconds):
+        super().__init__(directory, prefix, ".wav", max_bytes, max_seconds)
+        self.rate = rate
+        self.wav = None
+
+    def open(self, now):
+        f = super().open(now)
+        self.wav = wave.open(f, "wb")
+        self.wav.setnchannels(1)
+        self.wav.setsampwidth(2)
+        self.wav.setframerate(self.rate)
+
+    def write(self, audio):
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+        self.wav.writeframesraw(pcm.tobytes())
+        self.bytes += pcm.nbytes
+
+    def close(self):
+        # el archivo se cierra aunque falle la cabecera (sin fugas de descriptores)
+        try:
+            if self.wav is not None:
+                wav, self.wav = self.wav, None
+                wav.close()      # actualiza la cabecera con el tamaño real
+        finally:
+            super().close()
+
+
+class _IqSegment(_Segment):
+    def __init__(self, directory, prefix, rate, center_freq, max_bytes, max_seconds):
+        super().__init__(directory, prefix, ".cf32", max_bytes, max_seconds)
+        self.rate = rate
+        self.center_freq = center_freq
+        self.samples = 0
+
+    def open(self, now):
+        super().open(now)
+        self.samples = 0
+
+    def write(self, iq):
+        iq = np.asarray(iq, dtype=np.complex64)
+        self.file.write(iq.tobytes())
+        self.bytes += iq.nbytes
+        self.samples += len(iq)
+
+    def close(self):
+        try:
+            self._write_meta()
+        finally:
+            super().close()
+
+    def _write_meta(self):
+        if self.file is not None:
+            meta = {
+                "sample_rate": self.rate,
+                "center_freq": self.center_freq,
+                "dtype": "complex64",
+                "samples": self.samples,
+                "start": self.opened_at,
+            }
+            with open(os.path.splitext(self.path)[0] + ".json", "w") as f:
+                json.dump(meta, f, indent=2)
+
+# ------------------------------------------
+#  GRABADOR
+# ------------------------------------------
+
+class Recorder:
+    def __init__(self, directory="grabaciones", audio_rate=48000, iq_rate=None, center_freq=None,
+                 max_bytes=256 * 1024 * 1024, max_seconds=15 * 60, queue_blocks=64):
+        os.makedirs(directory, exist_ok=True)
+        self.audio = _WavSegment(directory, "audio", audio_rate, max_bytes, max_seconds)
+        self.iq = None
+        if iq_rate is not None:
+            self.iq = _IqSegment(directory, "iq", iq_rate, center_freq, max_bytes, max_seconds)
+
+        self.q = queue.Queue(maxsize=queue_blocks)
+        self.stats = {"blocks_written": 0, "bytes_written": 0, "dropped_blocks": 0,
+                      "dropped_samples": 0, "segments": 0, "max_queue": 0,
+                      "write_errors": 0, "last_error": None}
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    # --- llamado desde el bucle de captura ---
+    def _put(self, kind, data):
+        try:
+            self.q.put_nowait((kind, data))
+        except queue.Full:
+            self.stats["dropped_blocks"] += 1
+            self.stats["dropped_samples"] += len(data)
+            return False
+        depth = self.q.qsize()
+        if depth > self.stats["max_queue"]:
+            self.stats["max_queue"] = depth
+        return True
+
+    def write_audio(self, audio):
+        return self._put("audio", audio)
+
+    def write_iq(self, iq):
+        if self.iq is None:
+            return False
+        return self._put("iq", iq)
+
+    # --- hilo escritor ---
+    def _writer(self):
+        while True:
+            item = self.q.get()
+            if item is None:
+                break
+            kind, data = item
+            seg = self.audio if kind == "audio" else self.iq
+            try:
+                now = time.time()
+                if seg.due(now):
+                    seg.close()
+                    seg.open(now)
+                    self.stats["segments"] += 1
+                before = seg.bytes
+                seg.write(data)
+                self.stats["blocks_written"] += 1
+                self.stats["bytes_written"] += seg.bytes - before
+            except Exception as e:
+                self._error(e, seg)
+
+        for seg in (self.audio, self.iq):
+            if seg is not None:
+                try:
+                    seg.close()
+                except Exception as e:
+                    self._error(e, None)
+
+    def _error(self, e, seg):
+        self.stats["write_errors"] += 1
+        self.stats["last_error"] = f"{type(e).__name__}: {e}"
+        if seg is not None:
+            # descartar el segmento a medio escribir: el próximo bloque abre otro.
+            # close() libera el archivo aunque falle; ese segundo error también se registra
+            try:
+                seg.close()
+            except Exception as e2:
+                self.stats["write_errors"] += 1
+                self.stats["last_error"] += f"; al cerrar: {type(e2).__name__}: {e2}"
+
+    def close(self, timeout=10.0):
+        # espera a vaciar la cola y cierra los segmentos abiertos;
+        # devuelve False si el escritor no terminó a tiempo
+        try:
+            self.q.put(None, timeout=timeout)
+        except queue.Full:
+            return False
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def report(self):
+        s = self.stats
+        return (f"grabados={s['blocks_written']} bloques ({s['bytes_written'] / 1e6:.1f} MB), "
+                f"segmentos={s['segments']}, cola máx={s['max_queue']}/{self.q.maxsize}, "
+                f"descartados={s['dropped_blocks']} bloques ({s['dropped_samples']} muestras)"
+                + (f", errores={s['write_errors']} ({s['last_error']})" if s["write_errors"] else ""))
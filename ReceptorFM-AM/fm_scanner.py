@@ -0,0 +1,365 @@
+# Escáner con memoria de frecuencias (comportamiento de "radio scanner")
+# - Lista de canales con prioridad, tiempo de permanencia (dwell) y umbral propios
+# - Canales que caben en el mismo ancho de captura se agrupan en una parada: una
+#   sola sintonía y una FFT miden todos a la vez
+# - Siguiente parada = la más "urgente" (prioridad × tiempo sin visitar) menos
+#   el costo de re-sintonizar el PLL desde la frecuencia actual
+# - Dwell adaptativo: canales con actividad reciente usan su dwell completo,
+#   los que llevan mucho tiempo en silencio, el mínimo
+# - Con actividad se detiene en el canal (escucha) y retoma el barrido tras
+#   `hang` segundos sin actividad; mientras escucha, mira de reojo los canales
+#   de mayor prioridad cada `priority_check` segundos
+# - metrics(): intervalo de revisita por canal (p50/p95), costo de sintonía y
+#   tasa estimada de actividad perdida (test_scanner.py la compara con la real)
+#
+# Uso: python fm_scanner.py [canales.json]
+#   canales.json: [{"freq": 101.7e6, "label": "...", "priority": 3, "dwell": 0.2}, ...]
+
+import sys
+import json
+import time
+import numpy as np
+
+# ------------------------------------------
+#  COSTO DE SINTONÍA
+# ------------------------------------------
+
+def pll_cost(f_from, f_to, settle=0.008, per_mhz=0.0002):
+    # segundos perdidos al re-sintonizar: asentamiento del PLL + descarte de muestras,
+    # algo mayor cuanto más lejos (filtro de seguimiento del R820T)
+    if f_from is None:
+        return settle
+    if f_from == f_to:
+        return 0.0
+    return settle + per_mhz * abs(f_to - f_from) / 1e6
+
+
+def measure_retune_cost(sdr, freqs, discard=16384):
+    # costo real en este dongle: asignar center_freq + leer y descartar un bloque corto
+    costs = []
+    for a, b in zip(freqs[:-1], freqs[1:]):
+        sdr.center_freq = a
+        sdr.read_samples(discard)
+        t0 = time.perf_counter()
+        sdr.center_freq = b
+        sdr.read_samples(discard)
+        costs.append((abs(b - a), time.perf_counter() - t0 - discard / sdr.sample_rate))
+    return costs
+
+
+def fit_pll_cost(costs):
+    # ajuste lineal costo = settle + per_mhz · |Δf| sobre measure_retune_cost()
+    df = np.array([d for d, _ in costs]) / 1e6
+    t = np.array([c for _, c in costs])
+    per_mhz, settle = np.polyfit(df, t, 1) if len(set(df)) > 1 else (0.0, float(np.mean(t)))
+    settle, per_mhz = max(float(settle), 0.0), max(float(per_mhz), 0.0)
+    return lambda f_from, f_to: pll_cost(f_from, f_to, settle, per_mhz), settle, per_mhz
+
+# ------------------------------------------
+#  CANALES Y PARADAS
+# ------------------------------------------
+
+class Channel:
+    def __init__(self, freq, label=None, priority=1, dwell=0.2, min_dwell=0.05, threshold_db=10.0,
+                 bandwidth=150e3):
+        self.freq = freq
+        self.label = label or f"{freq / 1e6:.3f} MHz"
+        self.priority = priority
+        self.dwell = dwell
+        self.min_dwell = min_dwell
+        self.threshold_db = threshold_db
+        self.bandwidth = bandwidth
+        # estado y métricas
+        self.last_visit = None
+        self.last_active = None
+        self.visits = 0
+        self.revisits = []
+        self.detections = 0
+        self.activity_starts = 0
+        self.activity_time = 0.0
+        self.active = False
+
+    def effective_dwell(self, now, memory=60.0):
+        recent = self.last_active is not None and now - self.last_active < memory
+        return self.dwell if recent else self.min_dwell
+
+
+class Stop:
+    def __init__(self, center, channels, dwell, listen=False):
+        self.center = center
+        self.channels = channels
+        self.dwell = dwell
+        self.listen = listen
+
+    def __repr__(self):
+        kind = "escucha" if self.listen else "barrido"
+        return f"Stop({kind} {self.center / 1e6:.3f} MHz, {len(self.channels)} canales, {self.dwell:.2f} s)"
+
+
+def group_channels(channels, span, sample_rate=None, dc_guard=10e3):
+    # agrupa canales ordenados por frecuencia que caben en `span` Hz (bordes incluidos)
+    groups = []
+    for ch in sorted(channels, key=lambda c: c.freq):
+        if groups and ch.freq + ch.bandwidth / 2 - (groups[-1][0].freq - groups[-1][0].bandwidth / 2) <= span:
+            groups[-1].append(ch)
+        else:
+            groups.append([ch])
+    return [(tuner_center(g, sample_rate, dc_guard), g) for g in groups]
+
+
+def tuner_center(group, sample_rate=None, dc_guard=10e3):
+    # centro del tuner lejos del pico de DC del RTL-SDR: un canal solo se corre fs/4;
+    # en un grupo, si el punto medio cae dentro de un canal se corre lo justo para liberarlo
+    mid = (group[0].freq + group[-1].freq) / 2
+    if sample_rate is None:
+        return mid
+    if len(group) == 1:
+        return group[0].freq + sample_rate / 4
+    for ch in group:
+        clear = ch.bandwidth / 2 + dc_guard - abs(ch.freq - mid)
+        if clear > 0:
+            c = mid - clear if ch.freq >= mid else mid + clear
+            lo, hi = group[0].freq - group[0].bandwidth / 2, group[-1].freq + group[-1].bandwidth / 2
+            if max(c - lo, hi - c) <= 0.45 * sample_rate:
+                return c
+    return mid
+
+# ------------------------------------------
+#  PLANIFICADOR
+# ------------------------------------------
+
+class ScannerScheduler:
+    def __init__(self, channels, sample_rate=1.024e6, hang=2.0, listen_slice=0.25,
+                 priority_check=2.0, retune_cost=pll_cost, retune_weight=20.0, usable=0.8):
+        # retune_weight: barrido en test_scanner.py; 20 es el menor que sintoniza menos
+        # que el barrido secuencial sin perder más actividad (prioritaria ni total)
+        self.channels = list(channels)
+        self.hang = hang
+        self.listen_slice = listen_slice
+        self.priority_check = priority_check
+        self.retune_cost = retune_cost
+        self.retune_weight = retune_weight
+        self.groups = group_channels(self.channels, usable * sample_rate, sample_rate)
+        self.center_of = {c.freq: center for center, g in self.groups for c in g}
+        self.priority_sum = sum(c.priority for c in self.channels)
+        self.center = None
+        self.holding = None                 # canal en escucha
+        self.last_priority_check = 0.0
+        self.t_start = None
+        self.tune_time = 0.0
+        self.retunes = 0
+
+    # --- elección de la siguiente parada ---
+    def _urgency(self, group, now):
+        u = 0.0
+        for ch in group:
+            age = now - ch.last_visit if ch.last_visit is not None else 1e6
+            u += ch.priority * age
+        return u
+
+    def _scan_stop(self, now, groups=None):
+        groups = groups or self.groups
+        best, best_score = None, -np.inf
+        for center, chans in groups:
+            cost = self.retune_cost(self.center, center)
+            # cada segundo sintonizando suma sum(prioridades) de urgencia a toda la lista:
+            # saltar lejos sólo vale si el destino está bastante más atrasado
+            score = self._urgency(chans, now) - self.retune_weight * cost * self.priority_sum
+            if score > best_score:
+                best, best_score = (center, chans), score
+        center, chans = best
+        return Stop(center, chans, max(c.effective_dwell(now) for c in chans))
+
+    def next(self, now=None):
+        now = time.monotonic() if now is None else now
+        if self.t_start is None:
+            self.t_start = now
+        if self.holding is not None:
+            ch = self.holding
+            # vistazo a canales de mayor prioridad mientras se escucha
+            if now - self.last_priority_check >= self.priority_check:
+                higher = [g for g in self.groups if any(c.priority > ch.priority for c in g[1])]
+                if higher:
+                    self.last_priority_check = now
+                    stop = self._scan_stop(now, higher)
+                    stop.dwell = min(c.min_dwell for c in stop.channels)
+                    return stop
+            # se escucha desde el centro de su grupo: sin re-sintonizar, el audio se
+            # obtiene desplazando el canal a banda base
+            return Stop(self.center_of[ch.freq], [ch], self.listen_slice, listen=True)
+        return self._scan_stop(now)
+
+    # --- resultado de una parada ---
+    def tuned(self, center):
+        # llamar al sintonizar; devuelve el costo estimado (para simulación y métricas)
+        cost = self.retune_cost(self.center, center)
+        if center != self.center:
+            self.retunes += 1
+        self.tune_time += cost
+        self.center = center
+        return cost
+
+    def observe(self, stop, active, now=None):
+        # active: dict freq → bool (o nivel dB sobre el piso, comparado con el umbral)
+        now = time.monotonic() if now is None else now
+        for ch in stop.channels:
+            a = active.get(ch.freq, False)
+            if not isinstance(a, (bool, np.bool_)):
+                a = a >= ch.threshold_db
+            if ch.last_visit is not None and not stop.listen:
+                ch.revisits.append(now - ch.last_visit)
+            ch.last_visit = now
+            ch.visits += 1
+            if a:
+                ch.detections += 1
+                if not ch.active:
+                    ch.activity_starts += 1
+                ch.activity_time += stop.dwell
+                ch.last_active = now
+            ch.active = bool(a)
+
+        actives = [c for c in stop.channels if c.active]
+        if actives:
+            best = max(actives, key=lambda c: c.priority)
+            if self.holding is None or best.priority > self.holding.priority:
+                self.holding = best
+                self.last_priority_check = now
+        elif self.holding is not None and now - (self.holding.last_active or 0) > self.hang:
+            self.holding = None                 # fin del hang: retomar barrido
+
+    # --- métricas ---
+    def metrics(self, now=None):
+        now = time.monotonic() if now is None else now
+        elapsed = max(now - self.t_start if self.t_start is not None else 0.0, 1e-9)
+        per_channel = []
+        for ch in self.channels:
+            r = np.array(ch.revisits) if ch.revisits else np.array([np.nan])
+            mean_burst = ch.activity_time / ch.activity_starts if ch.activity_starts else None
+            # una actividad empieza en un hueco de largo R con probabilidad ∝ R y se
+            # pierde si termina antes de la siguiente visita; con duraciones
+            # exponenciales de media D: P(pérdida | R) = 1 − D (1 − e^(−R/D)) / R
+            miss = None
+            if mean_burst and ch.revisits:
+                lost = r - mean_burst * (1 - np.exp(-r / mean_burst))
+                miss = float(lost.sum() / r.sum())
+            per_channel.append({"label": ch.label, "freq": ch.freq, "priority": ch.priority,
+                                "visits": ch.visits,
+                                "revisit_p50": float(np.nanpercentile(r, 50)),
+                                "revisit_p95": float(np.nanpercentile(r, 95)),
+                                "activity": ch.activity_starts, "missed_estimate": miss})
+        visits = sum(c.visits for c in self.channels)
+        return {"elapsed": elapsed, "retunes": self.retunes, "tune_fraction": self.tune_time / elapsed,
+                "tune_per_visit": self.tune_time / max(1, visits), "channels": per_channel}
+
+# ------------------------------------------
+#  MEDICIÓN DE ACTIVIDAD EN UNA CAPTURA
+# ------------------------------------------
+
+def channel_levels(fft, samples, sample_rate, center, channels):
+    # nivel (dB sobre la mediana del espectro) de cada canal dentro de la captura;
+    # fft: un FFTProvider creado una vez (plan, ventana y backend fuera del bucle)
+    fft_size = fft.size
+    n = len(samples) // fft_size
+    p = np.mean([10 ** (fft.power_db(samples[i * fft_size:(i + 1) * fft_size]) / 10) for i in range(n)], axis=0)
+    floor = np.median(p)
+    bin_hz = sample_rate / fft_size
+    levels = {}
+    for ch in channels:
+        c = int(round((ch.freq - center) / bin_hz)) + fft_size // 2
+        half = max(1, int(ch.bandwidth / bin_hz / 2))
+        levels[ch.freq] = 10 * np.log10(np.mean(p[max(0, c - half):c + half]) / floor)
+    return levels
+
+# ------------------------------------------
+#  MAIN ESCÁNER
+# ------------------------------------------
+
+DEFAULT_CHANNELS = [
+    {"freq": 88.1e6, "priority": 1}, {"freq": 91.3e6, "priority": 1},
+    {"freq": 97.1e6, "priority": 2}, {"freq": 97.5e6, "priority": 1},
+    {"freq": 101.7e6, "priority": 3}, {"freq": 107.1e6, "priority": 1},
+]
+
+
+def main():
+    from rtlsdr import RtlSdr
+    import sounddevice as sd
+    import scipy.signal as sig
+    from fm_kernels import fm_demod
+    from fm_fft import FFTProvider
+
+    specs = DEFAULT_CHANNELS
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            specs = json.load(f)
+    channels = [Channel(**s) for s in specs]
+
+    sdr = RtlSdr()
+    sdr.sample_rate = 1.024e6
+    sdr.gain = 40
+    AUDIO_RATE = 48000
+
+    stream = sd.OutputStream(samplerate=AUDIO_RATE, channels=1, dtype='float32',
+                             blocksize=1024, latency='low')
+    stream.start()
+    lpf = sig.firwin(101, cutoff=100e3, fs=sdr.sample_rate)
+    zi = np.zeros(len(lpf) - 1, dtype=np.complex128)
+    mix_n = 0                                  # fase continua del mezclador entre paradas
+
+    # costo de sintonía medido en este dongle: ida y vuelta entre los centros de grupo
+    centers = [c for c, _ in group_channels(channels, 0.8 * sdr.sample_rate, sdr.sample_rate)]
+    cost = pll_cost
+    if len(centers) > 1:
+        cost, settle, per_mhz = fit_pll_cost(measure_retune_cost(sdr, centers + centers[-2::-1]))
+        print(f"⏱  re-sintonía: {settle * 1000:.1f} ms + {per_mhz * 1000:.2f} ms/MHz")
+
+    sched = ScannerScheduler(channels, sdr.sample_rate, retune_cost=cost)
+    fft = FFTProvider(4096)
+    print(f"📻 Escaneando {len(channels)} canales en {len(sched.groups)} paradas… CTRL+C para salir")
+
+    last_report = time.monotonic()
+    try:
+        while True:
+            stop = sched.next()
+            if stop.center != sched.center:
+                sdr.center_freq = stop.center
+                sdr.read_samples(16384)           # descartar muestras mientras asienta el PLL
+                zi[:] = 0
+            sched.tuned(stop.center)
+
+            samples = sdr.read_samples(int(stop.dwell * sdr.sample_rate) // 4096 * 4096 or 4096)
+            levels = channel_levels(fft, samples, sdr.sample_rate, stop.center, stop.channels)
+            was = sched.holding
+            sched.observe(stop, levels)
+
+            if stop.listen:
+                # canal desplazado del centro del grupo → banda base
+                offset = stop.channels[0].freq - stop.center
+                n = mix_n + np.arange(len(samples))
+                mix_n += len(samples)
+                channel, zi = sig.lfilter(lpf, 1.0, samples * np.exp(-2j * np.pi * offset / sdr.sample_rate * n), zi=zi)
+                audio = sig.resample_poly(fm_demod(channel), up=3, down=64)
+                m = np.max(np.abs(audio))
+                if m > 0:
+                    stream.write((audio / m * 0.8).astype(np.float32))
+            if sched.holding is not was:
+                if sched.holding is not None:
+                    print(f"🔊 actividad en {sched.holding.label}")
+                else:
+                    print("🔎 retomando barrido")
+
+            if time.monotonic() - last_report > 30:
+                last_report = time.monotonic()
+                m = sched.metrics()
+                print(f"📊 sintonía {m['tune_fraction'] * 100:.1f} % del tiempo, {m['retunes']} re-sintonías")
+                for c in m["channels"]:
+                    print(f"   {c['label']:14s} p{c['priority']}  revisita p95 {c['revisit_p95']:.2f} s  "
+                          f"actividad {c['activity']}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stream.stop()
+        sdr.close()
+
+if __name__ == "__main__":
+    main()
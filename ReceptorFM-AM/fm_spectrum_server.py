@@ -0,0 +1,406 @@
+# Servidor de espectro/cascada remoto: un FFT, muchos visores por WebSocket
+# - Cada fila se cuantiza UNA vez a uint8 (dB entre db_min y db_max)
+# - Cada visor elige su zoom por query string: /ws?bins=1024&lo=0.25&hi=0.75&fps=10
+#   Los visores con la misma vista comparten un canal: la fila se reduce (máximo
+#   por grupo de bines), se codifica y se escribe el mismo objeto bytes a todos
+# - Codificación: delta contra la fila anterior del canal (con banda muerta) y
+#   RLE de los ceros; cuadro clave periódico y al conectarse cada visor
+# - /stats: ancho de banda por visor y, por canal, compresión frente a la fila
+#   float32 completa y ganancia de delta/RLE sobre la fila uint8 reducida
+#
+# Uso:
+#   python fm_spectrum_server.py            → RTL-SDR en 100 MHz, puerto 8001
+#   python fm_spectrum_server.py --sintetico
+# Visores: http://host:8001/  (cascada en el navegador)
+#
+# Formato de cuadro (binario, little endian):
+#   tipo u8 (0 clave, 1 delta) | 0 u8 | bines u16 | seq u32 | db_min f32 | db_max f32 | datos
+#   clave: bytes uint8 crudos; delta: RLE (0x00 n → n deltas nulos; otro byte → delta mod 256)
+
+import sys
+import json
+import time
+import base64
+import struct
+import hashlib
+import asyncio
+import threading
+import numpy as np
+from urllib.parse import urlsplit, parse_qs
+
+from fm_audio_server import WS_GUID, ws_header
+
+HEADER = struct.Struct("<BBHIff")
+
+# ------------------------------------------
+#  CODIFICACIÓN
+# ------------------------------------------
+
+def quantize(row_db, db_min, db_max):
+    q = (np.asarray(row_db, dtype=np.float32) - db_min) * (255.0 / (db_max - db_min))
+    return np.clip(q, 0, 255).astype(np.uint8)
+
+
+def decimate_bins(q, bins, lo=0.0, hi=1.0):
+    # recorte [lo, hi) y reducción por máximo (no se pierden portadoras angostas)
+    n = len(q)
+    q = q[int(lo * n):max(int(hi * n), int(lo * n) + 1)]
+    k = -(-len(q) // bins)
+    if k <= 1:
+        return q
+    pad = (-len(q)) % k
+    if pad:
+        q = np.concatenate((q, np.full(pad, q[-1], dtype=q.dtype)))
+    return q.reshape(-1, k).max(axis=1)
+
+
+def rle_zeros(d):
+    # 0x00 n → n ceros (1..255); cualquier otro byte va literal
+    zero = d == 0
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], zero, [False])).astype(np.int8)))
+    starts, ends = edges[::2], edges[1::2]
+    out = bytearray()
+    pos = 0
+    for s, e in zip(starts, ends):
+        out += d[pos:s].tobytes()
+        n = e - s
+        out += bytes((0, 255)) * (n // 255)
+        if n % 255:
+            out += bytes((0, n % 255))
+        pos = e
+    out += d[pos:].tobytes()
+    return bytes(out)
+
+
+def unrle_zeros(data, n):
+    out = np.zeros(n, dtype=np.uint8)
+    i = pos = 0
+    while i < len(data):
+        if data[i] == 0:
+            pos += data[i + 1]
+            i += 2
+        else:
+            out[pos] = data[i]
+            pos += 1
+            i += 1
+    return out
+
+
+def decode_frame(frame, prev=None):
+    # inverso de Channel.encode (para pruebas y clientes Python)
+    kind, _, n, seq, db_min, db_max = HEADER.unpack_from(frame)
+    data = frame[HEADER.size:]
+    if kind == 0:
+        row = np.frombuffer(data, dtype=np.uint8).copy()
+    else:
+        row = (prev + unrle_zeros(data, n)).astype(np.uint8)
+    return row, seq, db_min, db_max
+
+# ------------------------------------------
+#  CANALES (visores con la misma vista)
+# ------------------------------------------
+
+class Channel:
+    def __init__(self, key, server):
+        self.bins, self.lo, self.hi, self.fps = key
+        self.server = server
+        self.clients = {}                 # writer → stats del visor
+        self.prev = None                  # lo que tienen todos los visores del canal
+        self.acc = None
+        self.count = 0
+        self.seq = 0
+        self.next_send = 0.0
+        self.n_full = 0
+        self.raw_bytes = 0                # fila completa en float32 (lo que se evita enviar)
+        self.row_bytes = 0                # fila reducida en uint8, antes de delta/RLE
+        self.sent_bytes = 0
+
+    def add_row(self, q, now):
+        self.n_full = len(q)
+        d = decimate_bins(q, self.bins, self.lo, self.hi).astype(np.uint16)
+        self.acc = d if self.acc is None else self.acc + d
+        self.count += 1
+        if now < self.next_send:
+            return None
+        self.next_send = max(self.next_send + 1.0 / self.fps, now)
+        row = (self.acc // self.count).astype(np.uint8)
+        self.acc = None
+        self.count = 0
+        return self.encode(row)
+
+    def encode(self, row):
+        s = self.server
+        key = self.prev is None or len(self.prev) != len(row) or self.seq % s.key_interval == 0
+        if not key:
+            d = row.astype(np.int16) - self.prev
+            d[np.abs(d) <= s.deadband] = 0   # el visor conserva el valor anterior
+            payload = rle_zeros(d.astype(np.uint8))
+            # con ruido que cambia en todos los bines el delta no comprime: va clave
+            key = len(payload) >= len(row)
+            if not key:
+                self.prev = (self.prev + d).astype(np.uint8)
+        if key:
+            payload = row.tobytes()
+            self.prev = row
+        self.seq += 1
+        body = HEADER.pack(0 if key else 1, 0, len(row), self.seq, s.db_min, s.db_max) + payload
+        self.raw_bytes += self.n_full * 4
+        self.row_bytes += len(row)
+        self.sent_bytes += len(body)
+        return ws_header(len(body)) + body
+
+    def keyframe(self):
+        if self.prev is None:
+            return None
+        s = self.server
+        body = HEADER.pack(0, 0, len(self.prev), self.seq, s.db_min, s.db_max) + self.prev.tobytes()
+        return ws_header(len(body)) + body
+
+# ------------------------------------------
+#  SERVIDOR
+# ------------------------------------------
+
+class SpectrumServer:
+    def __init__(self, host="0.0.0.0", port=8001, db_min=-20.0, db_max=60.0,
+                 key_interval=50, deadband=2, max_buffer=512 * 1024, max_fps=30):
+        self.host = host
+        self.port = port
+        self.db_min = db_min
+        self.db_max = db_max
+        self.key_interval = key_interval
+        self.deadband = deadband          # pasos de cuantización (~0.3 dB c/u con el rango por defecto);
+                                          # más banda muerta → deltas más ralos, menos detalle
+        self.max_buffer = max_buffer
+        self.max_fps = max_fps
+        self.loop = None
+        self.channels = {}
+        self.stats = {"rows": 0, "served": 0, "dropped_slow": 0}
+        self._t0 = time.time()
+        self._cpu0 = time.process_time()
+
+    # --- llamado desde el hilo del FFT ---
+    def publish(self, row_db):
+        q = quantize(row_db, self.db_min, self.db_max)
+        self.loop.call_soon_threadsafe(self._on_row, q)
+
+    def _on_row(self, q):
+        self.stats["rows"] += 1
+        now = time.monotonic()
+        for ch in list(self.channels.values()):
+            frame = ch.add_row(q, now)
+            if frame is None:
+                continue
+            for writer, st in list(ch.clients.items()):
+                self._send(ch, writer, st, frame)
+
+    def _send(self, ch, writer, st, frame):
+        transport = writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > self.max_buffer:
+            # visor lento: se suelta en vez de acumular memoria
+            self.stats["dropped_slow"] += 1
+            ch.clients.pop(writer, None)
+            transport.close()
+            return
+        transport.write(frame)
+        st["bytes"] += len(frame)
+        st["frames"] += 1
+
+    def _channel(self, query):
+        def arg(name, default, kind=float):
+            try:
+                return kind(query.get(name, [default])[0])
+            except ValueError:
+                return kind(default)
+        bins = min(max(arg("bins", 1024, int), 16), 65535)
+        lo = min(max(arg("lo", 0.0), 0.0), 1.0)
+        hi = min(max(arg("hi", 1.0), lo), 1.0)
+        fps = min(max(arg("fps", 10.0), 0.5), self.max_fps)
+        key = (bins, round(lo, 4), round(hi, 4), fps)
+        if key not in self.channels:
+            self.channels[key] = Channel(key, self)
+        return self.channels[key]
+
+    async def _viewer(self, reader, writer, query):
+        ch = self._channel(query)
+        peer = writer.get_extra_info("peername")
+        st = {"peer": f"{peer[0]}:{peer[1]}" if peer else "?", "since": time.monotonic(),
+              "bytes": 0, "frames": 0}
+        ch.clients[writer] = st
+        self.stats["served"] += 1
+        first = ch.keyframe()
+        if first is not None:
+            self._send(ch, writer, st, first)
+        try:
+            # los cuadros los envía _on_row; aquí sólo se espera el cierre del visor
+            while not writer.transport.is_closing():
+                if not await reader.read(1024):
+                    break
+        finally:
+            ch.clients.pop(writer, None)
+            if not ch.clients:
+                self.channels.pop((ch.bins, ch.lo, ch.hi, ch.fps), None)
+            writer.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+            writer.close()
+            return
+
+        lines = request.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        url = urlsplit(parts[1] if len(parts) > 1 else "/")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+
+        if url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+            key = headers.get("sec-websocket-key", "").encode()
+            accept = base64.b64encode(hashlib.sha1(key + WS_GUID).digest())
+            writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                         b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+            await self._viewer(reader, writer, parse_qs(url.query))
+            return
+        if url.path == "/":
+            body, ctype = VIEWER_HTML.encode(), b"text/html; charset=utf-8"
+        elif url.path == "/stats":
+            body, ctype = json.dumps(self.snapshot()).encode(), b"application/json"
+        else:
+            writer.write(b"HTTP/1.0 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            writer.close()
+            return
+        writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: " + ctype +
+                     b"\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+        await writer.drain()
+        writer.close()
+
+    def snapshot(self):
+        now = time.monotonic()
+        viewers, channels = [], []
+        for ch in self.channels.values():
+            channels.append({"bins": ch.bins, "lo": ch.lo, "hi": ch.hi, "fps": ch.fps,
+                             "viewers": len(ch.clients),
+                             "compression": round(ch.raw_bytes / ch.sent_bytes, 1) if ch.sent_bytes else None,
+                             "delta_rle": round(ch.row_bytes / ch.sent_bytes, 2) if ch.sent_bytes else None})
+            for st in ch.clients.values():
+                dt = max(now - st["since"], 1e-3)
+                viewers.append({"peer": st["peer"], "bins": ch.bins, "fps": ch.fps,
+                                "frames": st["frames"], "kbps": round(st["bytes"] * 8 / dt / 1000, 1)})
+        return dict(self.stats, viewers=viewers, channels=channels,
+                    uptime=time.time() - self._t0, cpu_time=time.process_time() - self._cpu0)
+
+    async def serve(self, ready=None):
+        self.loop = asyncio.get_running_loop()
+        server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+    def run(self, source):
+        ready = threading.Event()
+        threading.Thread(target=lambda: (ready.wait(), source(self)), daemon=True).start()
+        asyncio.run(self.serve(ready))
+
+    def run_in_thread(self):
+        # para publicar desde otro programa (p. ej. el SDRWorker de la GUI)
+        ready = threading.Event()
+        threading.Thread(target=lambda: asyncio.run(self.serve(ready)), daemon=True).start()
+        ready.wait()
+        return self
+
+# ------------------------------------------
+#  FUENTES
+# ------------------------------------------
+
+def power_db(samples, window):
+    X = np.fft.fftshift(np.fft.fft(samples * window))
+    return 10 * np.log10(np.abs(X) ** 2 / len(window) + 1e-12)
+
+
+def sdr_source(freq=100e6, fft_size=16384):
+    def run(server):
+        from rtlsdr import RtlSdr
+        sdr = RtlSdr()
+        sdr.sample_rate = 2.4e6
+        sdr.center_freq = freq
+        sdr.gain = 30
+        window = np.hanning(fft_size).astype(np.float32)
+        while True:
+            samples = sdr.read_samples(256 * 1024)
+            server.publish(power_db(samples[-fft_size:], window))
+    return run
+
+
+def synthetic_source(fft_size=16384, rows_per_s=20, avg=16, seed=0):
+    # ruido (promedio de `avg` periodogramas) + portadoras fijas y una que barre,
+    # a ritmo de tiempo real
+    def run(server):
+        rng = np.random.default_rng(seed)
+        t_next = time.time()
+        k = 0
+        while True:
+            p = rng.gamma(avg, 1.0 / avg, fft_size)
+            for c, w, g in ((0.2, 60, 300), (0.5, 8, 1000), (0.72, 90, 100)):
+                i = int(c * fft_size)
+                p[i - w:i + w] += g
+            i = int((0.1 + 0.8 * (k % 200) / 200) * fft_size)
+            p[i - 4:i + 4] += 500
+            server.publish(10 * np.log10(p) + 10)
+            k += 1
+            t_next += 1.0 / rows_per_s
+            time.sleep(max(0.0, t_next - time.time()))
+    return run
+
+# ------------------------------------------
+#  VISOR EN EL NAVEGADOR
+# ------------------------------------------
+
+VIEWER_HTML = """<!doctype html><meta charset="utf-8"><title>Espectro remoto</title>
+<body style="margin:0;background:#000;color:#ccc;font:12px monospace">
+<div id="info">conectando…</div><canvas id="c" width="1024" height="400"></canvas>
+<script>
+const q = location.search || "?bins=1024&fps=10";
+const ws = new WebSocket("ws://" + location.host + "/ws" + q);
+ws.binaryType = "arraybuffer";
+const c = document.getElementById("c"), g = c.getContext("2d");
+let prev = null, bytes = 0, t0 = performance.now();
+ws.onmessage = (ev) => {
+  const v = new DataView(ev.data), n = v.getUint16(2, true), data = new Uint8Array(ev.data, 16);
+  bytes += ev.data.byteLength;
+  let row;
+  if (v.getUint8(0) === 0) row = data.slice();
+  else {
+    row = prev.slice();
+    for (let i = 0, p = 0; i < data.length; ) {
+      if (data[i] === 0) { p += data[i + 1]; i += 2; } else { row[p] = (row[p] + data[i]) & 255; p++; i++; }
+    }
+  }
+  prev = row;
+  if (c.width !== n) c.width = n;
+  g.drawImage(c, 0, 1);
+  const img = g.createImageData(n, 1);
+  for (let i = 0; i < n; i++) { const x = row[i]; img.data.set([x, x > 128 ? 2 * (x - 128) : 0, 255 - x, 255], 4 * i); }
+  g.putImageData(img, 0, 0);
+  const s = (performance.now() - t0) / 1000;
+  document.getElementById("info").textContent = `${n} bines, ${(bytes * 8 / s / 1000).toFixed(1)} kbit/s`;
+};
+</script>"""
+
+
+def main():
+    source = synthetic_source() if "--sintetico" in sys.argv else sdr_source()
+    server = SpectrumServer()
+    print(f"🌊 Espectro remoto en http://0.0.0.0:{server.port}/  (ws: /ws?bins=1024&fps=10, stats: /stats)")
+    try:
+        server.run(source)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
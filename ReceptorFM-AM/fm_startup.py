@@ -0,0 +1,77 @@
+# Arranque rápido para los receptores
+# - LazyModule: el import real ocurre en el primer acceso a un atributo
+# - Warmup: imports pesados y compilación JIT en hilos de fondo, mientras el
+#   hilo principal abre la ventana o inicializa el RTL-SDR
+# - mark(): marca de tiempo de hitos de arranque (ventana, primer audio);
+#   con FM_STARTUP_BENCH=1 se imprimen para test_startup.py
+
+import os
+import time
+import importlib
+import threading
+
+T0 = time.perf_counter()
+BENCH = os.environ.get("FM_STARTUP_BENCH") == "1"
+
+_marks = {}
+
+
+def mark(label):
+    # sólo la primera vez que se alcanza cada hito
+    if label in _marks:
+        return
+    _marks[label] = (time.perf_counter() - T0) * 1000
+    if BENCH:
+        print(f"[startup] {label} {_marks[label]:.1f} ms", flush=True)
+
+# ------------------------------------------
+#  IMPORTS DIFERIDOS
+# ------------------------------------------
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+# ------------------------------------------
+#  PRECALENTAMIENTO EN SEGUNDO PLANO
+# ------------------------------------------
+
+class Warmup:
+    def __init__(self):
+        self._jobs = {}
+
+    def start(self, name, fn, *args):
+        job = {"result": None, "error": None}
+
+        def run():
+            try:
+                job["result"] = fn(*args)
+            except Exception as e:
+                job["error"] = e
+
+        job["thread"] = threading.Thread(target=run, name=f"warmup-{name}", daemon=True)
+        self._jobs[name] = job
+        job["thread"].start()
+        return self
+
+    def start_import(self, *modules):
+        for m in modules:
+            self.start(m, importlib.import_module, m)
+        return self
+
+    def get(self, name):
+        # espera a que termine el trabajo (si aún corre) y devuelve su resultado
+        job = self._jobs[name]
+        job["thread"].join()
+        if job["error"] is not None:
+            raise job["error"]
+        return job["result"]
@@ -1,17 +1,14 @@
-import numpy as np
-from rtlsdr import RtlSdr
-import sounddevice as sd
-import scipy.signal as sig
-from numba import njit
 import queue, threading
+import numpy as np
+
+from fm_startup import LazyModule, Warmup, mark
+
+# scipy.signal, sounddevice, rtlsdr y numba se importan bajo demanda
+sig = LazyModule("scipy.signal")
 
-@njit
-def fm_demod(iq):
-    out = np.empty(len(iq)-1, dtype=np.float32)
-    for i in range(len(iq)-1):
-        z = iq[i+1] * np.conj(iq[i])
-        out[i] = np.arctan2(z.imag, z.real)
-    return out
+def load_kernels():
+    import fm_kernels
+    return fm_kernels.warm()
 
 def deemphasis(audio, fs=48000):
     tau = 75e-6
@@ -24,21 +21,32 @@ def audio_worker(q, stream):
     while True:
         frame = q.get()
         stream.write(frame)
+        mark("first_audio")
 
 def main():
+    # imports pesados y JIT de numba en segundo plano mientras se abre el RTL-SDR
+    warmup = Warmup().start_import("scipy.signal", "sounddevice")
+    warmup.start("fm_demod", load_kernels)
+
+    from rtlsdr import RtlSdr
 
     sdr = RtlSdr()
     sdr.sample_rate = 1.024e6
     sdr.center_freq = 107.1e6
     sdr.gain = 40
+    mark("sdr_ready")
 
     BLOCK = 128 * 1024
     AUDIO_RATE = 48000
 
+    warmup.get("scipy.signal")
+    sd = warmup.get("sounddevice")
+
     sd.default.channels = 1
 
-    # LOWPASS 200 kHz
-    lpf = sig.firwin(101, cutoff=200e3, fs=1.024e6)
+    # LOWPASS 200 kHz (101 taps → overlap-save por FFT, con estado entre bloques)
+    from fm_filters import make_filter
+    lpf = make_filter(sig.firwin(101, cutoff=200e3, fs=1.024e6), block=BLOCK)
 
     stream = sd.OutputStream(
         samplerate=AUDIO_RATE,
@@ -52,12 +60,16 @@ def main():
     audio_q = queue.Queue(maxsize=10)
     threading.Thread(target=audio_worker, args=(audio_q, stream), daemon=True).start()
 
+    # normalmente ya compilado (o cargado de caché) mientras se abría el dongle
+    fm_demod = warmup.get("fm_demod")
+    mark("kernels_ready")
+
     print("🎧 Receptor FM Ultra Optimizado iniciado…")
 
     while True:
         samples = sdr.read_samples(BLOCK)
 
-        samples = sig.lfilter(lpf, 1.0, samples)
+        samples = lpf.process(samples)
 
         demod = fm_demod(samples)
 
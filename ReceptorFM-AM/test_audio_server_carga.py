@@ -0,0 +1,187 @@
+import sys
+import json
+import time
+import base64
+import asyncio
+import multiprocessing as mp
+
+from fm_audio_server import AudioServer, tone_source
+
+# ------------------------------------------
+#  GENERADOR DE CARGA EN LOCALHOST
+# ------------------------------------------
+# Levanta el servidor (fuente de tono en tiempo real) en otro proceso,
+# conecta N oyentes HTTP/WebSocket y mide el CPU del servidor por segundo
+# de audio → clientes por núcleo.
+# Antes verifica el protocolo: ping → pong y close → cierre limpio (no "lento"),
+# y que una fuente que falla cierre a los clientes y deje el error en /stats.
+
+PORT = 8765
+
+
+def run_server():
+    AudioServer(host="127.0.0.1", port=PORT).run(tone_source())
+
+
+def failing_source(server):
+    time.sleep(3.0)          # el cliente de check_failing_source ya está conectado
+    raise OSError("no se encontró el dongle")
+
+
+def run_failing_server():
+    AudioServer(host="127.0.0.1", port=PORT + 1).run(failing_source)
+
+
+async def fetch_stats(port=PORT):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /stats HTTP/1.0\r\n\r\n")
+    data = await reader.read()
+    writer.close()
+    return json.loads(data.split(b"\r\n\r\n", 1)[1])
+
+
+async def listener(websocket, counter, stop):
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    if websocket:
+        key = base64.b64encode(b"carga-0123456789").decode()
+        writer.write(f"GET /ws HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+    else:
+        writer.write(b"GET /audio.wav HTTP/1.0\r\n\r\n")
+    try:
+        while not stop.is_set():
+            data = await reader.read(65536)
+            if not data:
+                counter["closed"] += 1
+                break
+            counter["bytes"] += len(data)
+    finally:
+        writer.close()
+
+
+def ws_client_frame(opcode, payload):
+    mask = b"\x01\x02\x03\x04"
+    return (bytes((0x80 | opcode, 0x80 | len(payload))) + mask
+            + bytes(c ^ mask[i % 4] for i, c in enumerate(payload)))
+
+
+async def ws_read_frame(reader):
+    b0, b1 = await reader.readexactly(2)
+    n = b1 & 0x7F
+    if n == 126:
+        n = int.from_bytes(await reader.readexactly(2), "big")
+    elif n == 127:
+        n = int.from_bytes(await reader.readexactly(8), "big")
+    return b0 & 0x0F, await reader.readexactly(n)
+
+
+async def ws_connect(port=PORT):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(b"prueba-012345678").decode()
+    writer.write(f"GET /ws HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+    await reader.readuntil(b"\r\n\r\n")
+    return reader, writer
+
+
+async def check_protocol():
+    s0 = await fetch_stats()
+    reader, writer = await ws_connect()
+    writer.write(ws_client_frame(0x9, b"hola"))
+    pong = False
+    for _ in range(50):
+        op, data = await asyncio.wait_for(ws_read_frame(reader), 2)
+        if op == 0xA:
+            pong = data == b"hola"
+            break
+    writer.write(ws_client_frame(0x8, (1000).to_bytes(2, "big")))
+    closed = False
+    try:
+        for _ in range(50):
+            op, data = await asyncio.wait_for(ws_read_frame(reader), 2)
+            if op == 0x8:
+                closed = await asyncio.wait_for(reader.read(), 2) == b""
+                break
+    except asyncio.IncompleteReadError:
+        pass
+    writer.close()
+    await asyncio.sleep(0.3)
+    s1 = await fetch_stats()
+    clean = (s1["closed_by_client"] - s0["closed_by_client"] == 1
+             and s1["dropped_slow"] == s0["dropped_slow"])
+    print(f"{'✅' if pong else '❌'} ping → pong")
+    print(f"{'✅' if closed and clean else '❌'} close → cierre limpio "
+          f"(closed_by_client={s1['closed_by_client']}, dropped_slow={s1['dropped_slow']})")
+
+
+async def check_failing_source():
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT + 1)
+    writer.write(b"GET /audio.wav HTTP/1.0\r\n\r\n")
+    try:
+        await asyncio.wait_for(reader.read(), 5)       # EOF cuando la fuente falla
+        eof = True
+    except asyncio.TimeoutError:
+        eof = False
+    writer.close()
+    stats = await fetch_stats(PORT + 1)
+    ok = eof and stats["source_error"] and stats["clients"] == 0
+    print(f"{'✅' if ok else '❌'} fuente con error: clientes cerrados, source_error={stats['source_error']!r}")
+
+
+async def load(n_clients, seconds):
+    counter = {"bytes": 0, "closed": 0}
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(listener(i % 2 == 1, counter, stop)) for i in range(n_clients)]
+    await asyncio.sleep(1.0)                 # dejar que todos conecten
+
+    s0 = await fetch_stats()
+    b0 = counter["bytes"]
+    await asyncio.sleep(seconds)
+    s1 = await fetch_stats()
+    b1 = counter["bytes"]
+
+    stop.set()
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    wall = s1["uptime"] - s0["uptime"]
+    cpu = s1["cpu_time"] - s0["cpu_time"]
+    return {
+        "clients": s1["clients"],
+        "cpu_frac": cpu / wall,
+        "per_core": s1["clients"] / max(cpu / wall, 1e-9),
+        "mbps_rx": (b1 - b0) * 8 / wall / 1e6,
+        "dropped": s1["dropped_slow"] - s0["dropped_slow"],
+        "closed": counter["closed"],
+    }
+
+
+def main():
+    counts = [int(x) for x in sys.argv[1:]] or [10, 100, 400]
+    SECONDS = 5
+
+    server = mp.Process(target=run_server, daemon=True)
+    server.start()
+    failing = mp.Process(target=run_failing_server, daemon=True)
+    failing.start()
+    time.sleep(1.5)
+
+    try:
+        asyncio.run(check_protocol())
+        asyncio.run(check_failing_source())
+    finally:
+        failing.terminate()
+    print()
+
+    print(" clientes  CPU servidor  clientes/núcleo  Mbit/s recibidos  descartados")
+    try:
+        for n in counts:
+            r = asyncio.run(load(n, SECONDS))
+            print(f" {r['clients']:8d}  {100 * r['cpu_frac']:10.1f} %  {r['per_core']:15.0f}  "
+                  f"{r['mbps_rx']:16.1f}  {r['dropped']:11d}")
+    finally:
+        server.terminate()
+
+if __name__ == "__main__":
+    main()
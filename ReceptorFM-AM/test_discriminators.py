@@ -0,0 +1,31 @@
+import sys
+import numpy as np
+
+from fm_discriminators import DISCRIMINATORS, choose, measure, synthetic_fm
+
+# ------------------------------------------
+#  TABLA SNR DE AUDIO VS THROUGHPUT
+# ------------------------------------------
+# FM sintética (tono 1 kHz, desvío 75 kHz, 1.024 MS/s) sin ruido y con CNR 20 dB.
+# Uso: python test_discriminators.py [snr_mínimo_dB]
+#   con un mínimo, indica el discriminador más barato que lo cumple
+
+
+def main():
+    # error de fase de cada variante contra atan2 exacto
+    x = synthetic_fm(1 << 16)
+    ref = DISCRIMINATORS["exacto"](x)
+    table = measure()
+
+    print(f"{'discriminador':14s} {'Msps':>7s} {'SNR sin ruido':>14s} {'SNR CNR 20':>11s} {'err. fase máx':>14s}")
+    for r in table:
+        err = np.max(np.abs(DISCRIMINATORS[r["name"]](x) - ref))
+        print(f"{r['name']:14s} {r['msps']:7.1f} {r['snr_db']['None']:12.1f} dB "
+              f"{r['snr_db']['20.0']:8.1f} dB {err:14.2e}")
+
+    if len(sys.argv) > 1:
+        min_snr = float(sys.argv[1])
+        print(f"\n👉 más barato con SNR ≥ {min_snr:.0f} dB: {choose(min_snr, table)}")
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from rtlsdr import RtlSdr
 
+from fm_fft import FFTProvider
+
 def main():
     sdr = RtlSdr()
     sdr.sample_rate = 2.4e6
@@ -12,9 +14,8 @@ def main():
 
     samples = sdr.read_samples(256*1024)
 
-    # FFT
-    fft_data = np.fft.fftshift(np.fft.fft(samples))
-    power = 20 * np.log10(np.abs(fft_data))
+    # FFT (sin ventana, ya centrada; backend más rápido del equipo)
+    power = FFTProvider(len(samples), window_kind="rect").power_db(samples)
 
     freqs = np.linspace(
         sdr.center_freq - sdr.sample_rate/2,
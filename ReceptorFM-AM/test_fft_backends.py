@@ -0,0 +1,59 @@
+import time
+import numpy as np
+
+from fm_fft import BACKENDS, FFTProvider, benchmark
+
+# ------------------------------------------
+#  BENCHMARK DE BACKENDS FFT
+# ------------------------------------------
+# Espectro en dB (ventana + FFT + centrado + 20·log10) por tamaño y backend,
+# comparado con la forma original (fftshift(fft(frame * window)) en cada cuadro).
+# También verifica que todos los backends den el mismo espectro.
+
+SIZES = (4096, 16384, 65536, 262144)
+
+
+def original(x, window):
+    spec = np.fft.fftshift(np.fft.fft(x * window))
+    return 20 * np.log10(np.abs(spec) + 1e-12)
+
+
+def time_original(n, repeat=20):
+    x = (np.random.default_rng(0).standard_normal(n) * (1 + 1j))
+    window = np.hanning(n)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        original(x, window)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    x = (np.random.default_rng(1).standard_normal(16384) * (1 + 1j))
+    ref = original(x, np.hanning(16384))
+    ok = True
+    for b in BACKENDS:
+        err = np.max(np.abs(FFTProvider(16384, backend=b).power_db(x) - ref))
+        ok &= err < 1e-2
+        print(f"🔬 {b:6s} error máx vs fftshift(fft): {err:.1e} dB")
+
+    # tamaño impar: el (-1)^n no centra, debe seguir coincidiendo con fftshift
+    xo = x[:1023]
+    for b in BACKENDS:
+        err = np.max(np.abs(FFTProvider(1023, backend=b).power_db(xo) - original(xo, np.hanning(1023))))
+        ok &= err < 1e-2
+        print(f"🔬 {b:6s} N=1023 error máx vs fftshift(fft): {err:.1e} dB")
+
+    table = benchmark(SIZES)
+    names = list(BACKENDS)
+    print(f"\n{'tamaño':>8s} {'original':>10s} " + " ".join(f"{b:>9s}" for b in names) + "   más rápido")
+    for n in SIZES:
+        t = table[n]
+        best = min(t, key=t.get)
+        print(f"{n:8d} {time_original(n)*1000:8.2f}ms " + " ".join(f"{t[b]*1000:7.2f}ms" for b in names)
+              + f"   {best}")
+    print("\n✅ backends consistentes" if ok else "\n❌ los backends difieren")
+
+if __name__ == "__main__":
+    main()
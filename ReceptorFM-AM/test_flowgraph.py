@@ -0,0 +1,95 @@
+import json
+import numpy as np
+
+from fm_flowgraph import Block, Flowgraph, Resample
+
+# ------------------------------------------
+#  FLOWGRAPH: REPARTO SIN RECÁLCULO NI COPIAS
+# ------------------------------------------
+# Mismo grafo que flowgraphs/fm_espectro_audio.json pero con fuente sintética y
+# colectores: el filtro de canal alimenta espectro y demodulador y debe correr
+# una sola vez por bloque; espectro y demod deben recibir el MISMO arreglo.
+
+CONFIG = {
+    "blocks": {
+        "fuente":    {"type": "tono_fm", "sample_rate": 1024000, "block": 131072, "blocks": 20},
+        "canal":     {"type": "fir", "taps": 101, "cutoff": 200000, "block": 131072},
+        "espectro":  {"type": "espectro", "fft_size": 4096},
+        "demod":     {"type": "fm_demod"},
+        "audio48k":  {"type": "resample", "rate": 48000},
+        "deenfasis": {"type": "deemphasis"},
+        "nivel":     {"type": "normaliza"},
+        "vista":     {"type": "colector"},
+        "audio":     {"type": "colector"},
+        "filtrado":  {"type": "colector"},
+    },
+    "connections": [
+        ["fuente", "canal"],
+        ["canal", "espectro"], ["canal", "demod"], ["canal", "filtrado"],
+        ["demod", "audio48k"], ["audio48k", "deenfasis"], ["deenfasis", "nivel"],
+        ["nivel", "audio"], ["espectro", "vista"],
+    ],
+}
+
+
+def expect_error(config, text):
+    try:
+        Flowgraph(config)
+    except ValueError as e:
+        return text in str(e)
+    return False
+
+
+def main():
+    fg = Flowgraph(CONFIG)
+    seen = []
+    demod = fg.blocks["demod"]
+    orig = demod.work
+    demod.work = lambda **kw: (seen.append(kw["in"]), orig(**kw))[1]
+    fg.run()
+
+    ok = True
+    calls = {r["name"]: r["calls"] for r in fg.report()}
+    ok &= calls["canal"] == 20 and calls["demod"] == 20 and calls["espectro"] == 20
+    shared = fg.blocks["filtrado"].items
+    ok &= all(a is b for a, b in zip(seen, shared)) and not shared[0].flags.writeable
+    print(f"🧩 orden: {' → '.join(fg.order)}")
+    print(f"   canal: {calls['canal']} llamadas para 20 bloques, mismo arreglo en 3 consumidores: "
+          f"{all(a is b for a, b in zip(seen, shared))}")
+    print(f"   tasa de audio propagada: {fg.rates['nivel']:.0f} Hz")
+    ok &= fg.rates["nivel"] == 48000
+
+    audio = np.concatenate(fg.blocks["audio"].items)
+    spec = fg.blocks["vista"].items[-1]
+    print(f"   audio: {len(audio)} muestras, espectro: {len(spec)} bines")
+    ok &= len(audio) > 0 and len(spec) == 4096
+
+    bad_type = json.loads(json.dumps(CONFIG))
+    bad_type["connections"].append(["nivel", "espectro"])
+    ok &= expect_error(bad_type, "tipos incompatibles")
+    cycle = json.loads(json.dumps(CONFIG))
+    cycle["blocks"]["x"] = {"type": "normaliza"}
+    cycle["blocks"]["y"] = {"type": "normaliza"}
+    cycle["connections"] += [["x", "y"], ["y", "x"]]
+    ok &= expect_error(cycle, "ciclo")
+    print("   errores de tipo y ciclos detectados al construir")
+
+    # up/down salen de la tasa que llega, no de una relación fija 3/64
+    for rate, ratio in ((1.024e6, (3, 64)), (2.4e6, (1, 50)), (2.048e6, (3, 128))):
+        rs = Resample("audio48k", rate=48000)
+        out = rs.setup(rate)
+        ok &= (rs.up, rs.down) == ratio and out == 48000
+        print(f"   resample {rate / 1e6:.3f} MS/s → {rs.up}/{rs.down} = {out:.0f} Hz")
+
+    class SinWork(Block):
+        outputs = {"out": "real"}
+    try:
+        SinWork("x")
+        ok = False
+    except TypeError:
+        print("   un bloque sin work() no se puede instanciar")
+
+    print("   ✅ flowgraph correcto" if ok else "   ❌ flowgraph incorrecto")
+
+if __name__ == "__main__":
+    main()
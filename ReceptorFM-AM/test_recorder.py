@@ -0,0 +1,131 @@
+import os
+import glob
+import time
+import wave
+import tempfile
+import threading
+import numpy as np
+
+from fm_recorder import Recorder
+
+# ------------------------------------------
+#  VERIFICACIÓN DEL GRABADOR
+# ------------------------------------------
+# 1. rotación por tamaño: segmentos WAV/cf32 válidos que suman todo lo escrito
+# 2. cola llena: con el escritor detenido, los bloques de más se descartan y cuentan
+# 3. errores de escritura: se cuentan, el hilo sigue vivo y close() no se cuelga
+# 4. si además falla el cierre del segmento, el archivo igual se cierra (sin fugas)
+
+BLOCK = 4800          # 100 ms de audio a 48 kHz
+
+
+def rotation(tmp):
+    rec = Recorder(tmp, iq_rate=1.024e6, center_freq=101.7e6, max_bytes=64 * 1024)
+    audio = (0.5 * np.sin(np.arange(BLOCK) / 10)).astype(np.float32)
+    iq = np.ones(8192, dtype=np.complex64)
+    for _ in range(50):
+        while not rec.write_audio(audio):
+            time.sleep(0.001)
+        while not rec.write_iq(iq):
+            time.sleep(0.001)
+    closed = rec.close()
+
+    wavs = sorted(glob.glob(os.path.join(tmp, "audio_*.wav")))
+    frames = 0
+    for p in wavs:
+        with wave.open(p) as w:
+            frames += w.getnframes()
+    cf32 = sorted(glob.glob(os.path.join(tmp, "iq_*.cf32")))
+    iq_samples = sum(os.path.getsize(p) for p in cf32) // 8
+    metas = glob.glob(os.path.join(tmp, "iq_*.json"))
+    print(f"🔁 {len(wavs)} segmentos WAV ({frames} muestras), {len(cf32)} segmentos IQ "
+          f"({iq_samples} muestras), {len(metas)} .json")
+    print(f"   {rec.report()}")
+    return (closed and len(wavs) > 1 and len(cf32) > 1 and len(metas) == len(cf32)
+            and frames == 50 * BLOCK and iq_samples == 50 * 8192
+            and rec.stats["segments"] == len(wavs) + len(cf32))
+
+
+def drops(tmp):
+    rec = Recorder(tmp, queue_blocks=4)
+    gate = threading.Event()
+    write = rec.audio.write
+    rec.audio.write = lambda a: (gate.wait(), write(a))      # escritor detenido en el primer bloque
+    audio = np.zeros(BLOCK, dtype=np.float32)
+    accepted = sum(rec.write_audio(audio) for _ in range(20))
+    time.sleep(0.05)
+    gate.set()
+    closed = rec.close()
+    s = rec.stats
+    print(f"🧺 cola de 4: aceptados {accepted}/20, {rec.report()}")
+    # el escritor retiene 1 bloque y la cola guarda 4 → entre 4 y 5 aceptados
+    return (closed and 4 <= accepted <= 5 and s["dropped_blocks"] == 20 - accepted
+            and s["dropped_samples"] == s["dropped_blocks"] * BLOCK and s["blocks_written"] == accepted)
+
+
+def errors(tmp):
+    rec = Recorder(tmp, queue_blocks=4)
+    write = rec.audio.write
+    calls = {"n": 0}
+
+    def failing(a):
+        calls["n"] += 1
+        if calls["n"] % 3 == 0:
+            raise OSError(28, "No space left on device")
+        write(a)
+    rec.audio.write = failing
+
+    audio = np.zeros(BLOCK, dtype=np.float32)
+    for _ in range(30):
+        while not rec.write_audio(audio):
+            time.sleep(0.001)
+    t0 = time.perf_counter()
+    closed = rec.close(timeout=2.0)
+    s = rec.stats
+    print(f"💥 errores simulados: {rec.report()}  (close en {(time.perf_counter() - t0) * 1000:.0f} ms)")
+    return closed and s["write_errors"] == 10 and s["blocks_written"] == 20
+
+
+def close_errors(tmp):
+    rec = Recorder(tmp, queue_blocks=4)
+    seg = rec.audio
+    opened = []
+    open_segment = seg.open
+
+    def tracking_open(now):
+        open_segment(now)
+        opened.append(seg.file)
+
+        wav = seg.wav
+
+        def broken_header():
+            wav.close = lambda: None        # falla una vez (el __del__ de wave vuelve a llamar)
+            raise OSError(28, "No space left on device (cabecera)")
+        wav.close = broken_header
+    seg.open = tracking_open
+
+    def failing(a):
+        raise OSError(28, "No space left on device")
+    seg.write = failing
+
+    audio = np.zeros(BLOCK, dtype=np.float32)
+    for _ in range(3):
+        while not rec.write_audio(audio):
+            time.sleep(0.001)
+    closed = rec.close(timeout=2.0)
+    s = rec.stats
+    print(f"🔒 {len(opened)} segmentos abiertos, {sum(f.closed for f in opened)} cerrados, "
+          f"errores={s['write_errors']}  último: {s['last_error']}")
+    return closed and opened and all(f.closed for f in opened) and "al cerrar" in s["last_error"]
+
+
+def main():
+    checks = [("rotación por tamaño", rotation), ("descartes con cola llena", drops),
+              ("errores de escritura", errors), ("errores al cerrar sin fugas", close_errors)]
+    for name, check in checks:
+        with tempfile.TemporaryDirectory() as tmp:
+            ok = check(tmp)
+        print(f"{'✅' if ok else '❌'} {name}\n")
+
+if __name__ == "__main__":
+    main()
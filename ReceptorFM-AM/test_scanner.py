@@ -0,0 +1,146 @@
+import numpy as np
+
+from fm_fft import FFTProvider
+from fm_scanner import Channel, ScannerScheduler, channel_levels
+
+# ------------------------------------------
+#  SIMULACIÓN DEL ESCÁNER CON TRÁFICO SINTÉTICO
+# ------------------------------------------
+# Reloj simulado: cada canal alterna ráfagas de actividad (exponenciales) y
+# silencios. Una ráfaga cuenta como detectada si alguna observación del canal
+# la toca; si no, es actividad perdida (la verdad de terreno para comparar con
+# la estimación de metrics()).
+
+T = 900.0
+FREQS = [88.1, 88.5, 91.3, 94.7, 97.1, 97.5, 97.9, 99.9, 101.7, 104.3, 107.1, 107.5]
+PRIORITY = {101.7: 3, 97.1: 2}
+
+
+def traffic(rng, on_mean=2.0, off_mean=60.0):
+    bursts = {}
+    for f in FREQS:
+        t, b = rng.exponential(off_mean), []
+        while t < T:
+            d = rng.exponential(on_mean)
+            b.append([t, t + d, False])
+            t += d + rng.exponential(off_mean)
+        bursts[f * 1e6] = b
+    return bursts
+
+
+def make_channels(priorities=True, adaptive=True):
+    return [Channel(f * 1e6, priority=PRIORITY.get(f, 1) if priorities else 1, dwell=0.15,
+                    min_dwell=0.05 if adaptive else 0.15) for f in FREQS]
+
+
+def simulate(sched, bursts):
+    t = 0.0
+    while t < T:
+        stop = sched.next(t)
+        t += sched.tuned(stop.center)
+        t0, t1 = t, t + stop.dwell
+        active = {}
+        for ch in stop.channels:
+            on = False
+            for b in bursts[ch.freq]:
+                if b[0] < t1 and b[1] > t0:
+                    b[2] = True
+                    on = True
+            active[ch.freq] = on
+        t = t1
+        sched.observe(stop, active, t)
+    return sched.metrics(t)
+
+
+def missed(bursts, freqs):
+    b = [x for f in freqs for x in bursts[f] if x[1] < T]
+    return sum(not x[2] for x in b) / max(1, len(b))
+
+
+def main():
+    rng = np.random.default_rng(3)
+    base_traffic = traffic(rng)
+    configs = {
+        # barrido secuencial clásico: un canal por sintonía, dwell fijo, sin prioridades
+        "secuencial": lambda: ScannerScheduler(make_channels(False, False), usable=0.0, retune_weight=0.0),
+        "planificador": lambda: ScannerScheduler(make_channels()),
+    }
+
+    results = {}
+    for name, build in configs.items():
+        bursts = {f: [list(b) for b in v] for f, v in base_traffic.items()}
+        sched = build()
+        m = simulate(sched, bursts)
+        results[name] = m, missed(bursts, bursts), missed(bursts, [101.7e6, 97.1e6])
+
+        print(f"\n🔎 {name}: {len(sched.groups)} paradas, {m['retunes']} re-sintonías, "
+              f"sintonía {m['tune_fraction'] * 100:.1f} % del tiempo "
+              f"({m['tune_per_visit'] * 1000:.2f} ms por canal visitado)")
+        print(f"   actividad perdida: total {results[name][1] * 100:.1f} %, "
+              f"prioritarios {results[name][2] * 100:.1f} %")
+        for c in m["channels"]:
+            est = f"{c['missed_estimate'] * 100:5.1f} %" if c["missed_estimate"] is not None else "   —   "
+            print(f"   {c['label']:12s} p{c['priority']}  visitas {c['visits']:5d}  "
+                  f"revisita p50 {c['revisit_p50']:5.2f} s  p95 {c['revisit_p95']:5.2f} s  "
+                  f"pérdida estimada {est}")
+
+    (m0, miss0, prio0), (m1, miss1, prio1) = results["secuencial"], results["planificador"]
+    p95 = lambda m: max(c["revisit_p95"] for c in m["channels"] if c["freq"] == 101.7e6)
+    print()
+    print("✅ menos tiempo sintonizando" if m1["tune_fraction"] < m0["tune_fraction"]
+          else "❌ el planificador pasa más tiempo sintonizando")
+    print("✅ menos sintonía por canal visitado" if m1["tune_per_visit"] < m0["tune_per_visit"]
+          else "❌ el planificador sintoniza más por canal")
+    print("✅ menos actividad perdida en total" if miss1 <= miss0
+          else "❌ más actividad perdida en total")
+    print("✅ revisita más corta del canal prioritario" if p95(m1) < p95(m0)
+          else "❌ el canal prioritario no se revisita antes")
+    print("✅ menos actividad perdida en canales prioritarios" if prio1 <= prio0
+          else "❌ más actividad perdida en canales prioritarios")
+
+    # estimación de pérdida vs la real (agregada sobre los canales con actividad)
+    est = [c["missed_estimate"] for c in m1["channels"] if c["missed_estimate"] is not None]
+    ok = abs(np.mean(est) - miss1) < 0.15
+    print(f"{'✅' if ok else '❌'} pérdida estimada {np.mean(est) * 100:.1f} % vs real {miss1 * 100:.1f} %")
+
+    # ajuste: peso del costo de sintonía frente a la urgencia
+    print("\n⚖️  retune_weight → tiempo sintonizando / por canal / actividad perdida")
+    for w in (0.0, 1.0, 10.0, 20.0, 30.0):
+        bursts = {f: [list(b) for b in v] for f, v in base_traffic.items()}
+        m = simulate(ScannerScheduler(make_channels(), retune_weight=w), bursts)
+        print(f"   {w:5.1f}   {m['tune_fraction'] * 100:4.1f} %   {m['tune_per_visit'] * 1000:5.2f} ms   "
+              f"total {missed(bursts, bursts) * 100:5.1f} %   "
+              f"prioritarios {missed(bursts, [101.7e6, 97.1e6]) * 100:5.1f} %")
+
+    # ningún canal sobre el pico de DC del tuner
+    sched = ScannerScheduler(make_channels())
+    ok = all(abs(ch.freq - c) > ch.bandwidth / 2 for c, g in sched.groups for ch in g)
+    print(f"{'✅' if ok else '❌'} ningún canal sobre el DC ({len(sched.groups)} centros de tuner)")
+
+    # niveles de canal sobre una captura sintética (portadora FM en un canal del grupo)
+    center, group = next((c, g) for c, g in sched.groups if len(g) > 1)
+    fs = 1.024e6
+    n = np.arange(4 * 4096)
+    x = 0.05 * (rng.standard_normal(len(n)) + 1j * rng.standard_normal(len(n)))
+    x += np.exp(1j * (2 * np.pi * (group[0].freq - center) / fs * n + 5 * np.sin(2 * np.pi * 1e3 / fs * n)))
+    levels = channel_levels(FFTProvider(4096), x.astype(np.complex64), fs, center, group)
+    ok = (levels[group[0].freq] >= group[0].threshold_db
+          and all(levels[ch.freq] < ch.threshold_db for ch in group[1:]))
+    print(f"{'✅' if ok else '❌'} niveles: " + ", ".join(f"{ch.label} {levels[ch.freq]:.1f} dB" for ch in group))
+
+    # parada con actividad → escucha → retoma tras el hang
+    chans = make_channels()
+    sched = ScannerScheduler(chans, hang=2.0)
+    target = chans[FREQS.index(91.3)]
+    t, log = 0.0, []
+    while t < 12.0:
+        stop = sched.next(t)
+        t += sched.tuned(stop.center) + stop.dwell
+        sched.observe(stop, {ch.freq: ch is target and 1.0 <= t < 5.0 for ch in stop.channels}, t)
+        log.append((t, sched.holding is target))
+    held = [t for t, h in log if h]
+    ok = held and held[0] < 1.0 + 2.5 and 5.0 + 2.0 - 0.5 <= held[-1] <= 5.0 + 2.0 + 0.5
+    print(f"{'✅' if ok else '❌'} escucha {held[0]:.2f}–{held[-1]:.2f} s (actividad 1–5 s, hang 2 s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import sys
+import json
+import time
+import base64
+import asyncio
+import multiprocessing as mp
+import numpy as np
+
+from fm_spectrum_server import (HEADER, Channel, SpectrumServer, decimate_bins, decode_frame,
+                                quantize, synthetic_source)
+
+# ------------------------------------------
+#  CÓDEC + CARGA EN LOCALHOST
+# ------------------------------------------
+# 1) Filas sintéticas de 16k bines → canal → decodificación: el visor debe
+#    reconstruir cada fila con error ≤ banda muerta.
+# 2) Servidor con fuente sintética en otro proceso y N visores WebSocket con
+#    distintos zooms: ancho de banda por visor y CPU del servidor.
+# Uso: python test_spectrum_server.py [visores] [segundos]
+
+PORT = 8766
+N = 16384
+ZOOMS = ["bins=1024&fps=10", "bins=512&fps=5", "bins=2048&lo=0.4&hi=0.6&fps=10"]
+
+
+def codec_check():
+    server = SpectrumServer()
+    rng = np.random.default_rng(0)
+    ch = Channel((1024, 0.0, 1.0, 1000.0), server)
+    prev, worst, sent = None, 0, 0
+    for k in range(200):
+        p = rng.gamma(16, 1 / 16, N)
+        p[3000:3100] += 300
+        p[9000 + 10 * k: 9010 + 10 * k] += 500
+        q = quantize(10 * np.log10(p) + 10, server.db_min, server.db_max)
+        frame = ch.add_row(q, now=k)
+        ws_len = frame[1] & 0x7F
+        body = frame[2 + (2 if ws_len == 126 else 8 if ws_len == 127 else 0):]
+        prev, _, _, _ = decode_frame(body, prev)
+        truth = decimate_bins(q, 1024)
+        worst = max(worst, int(np.max(np.abs(prev.astype(int) - truth))))
+        sent += len(body)
+    raw = 200 * N * 4
+    print(f"🧪 códec: error máx {worst} pasos (banda muerta {server.deadband}), "
+          f"{raw / sent:.0f}× menos que float32 de {N} bines")
+    return worst <= server.deadband and np.array_equal(prev, ch.prev)
+
+
+def run_server():
+    SpectrumServer(host="127.0.0.1", port=PORT).run(synthetic_source(N, rows_per_s=20))
+
+
+async def fetch_stats():
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    writer.write(b"GET /stats HTTP/1.0\r\n\r\n")
+    data = await reader.read()
+    writer.close()
+    return json.loads(data.split(b"\r\n\r\n", 1)[1])
+
+
+async def viewer(query, counter, stop):
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    key = base64.b64encode(b"visor-0123456789").decode()
+    writer.write(f"GET /ws?{query} HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+    await reader.readuntil(b"\r\n\r\n")
+    prev = None
+    try:
+        while not stop.is_set():
+            hdr = await reader.readexactly(2)
+            n = hdr[1] & 0x7F
+            if n == 126:
+                n = int.from_bytes(await reader.readexactly(2), "big")
+            elif n == 127:
+                n = int.from_bytes(await reader.readexactly(8), "big")
+            body = await reader.readexactly(n)
+            if body[0] == 1 and prev is None:
+                counter["errors"] += 1
+                continue
+            prev, *_ = decode_frame(body, prev)
+            counter["frames"] += 1
+    except asyncio.IncompleteReadError:
+        counter["closed"] += 1
+    finally:
+        writer.close()
+
+
+async def load(n_viewers, seconds):
+    counter = {"frames": 0, "closed": 0, "errors": 0}
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(viewer(ZOOMS[i % len(ZOOMS)], counter, stop)) for i in range(n_viewers)]
+    await asyncio.sleep(1.0)
+    s0 = await fetch_stats()
+    await asyncio.sleep(seconds)
+    s1 = await fetch_stats()
+    stop.set()
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return s0, s1, counter
+
+
+def main():
+    n_viewers = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+
+    ok = codec_check()
+
+    proc = mp.Process(target=run_server, daemon=True)
+    proc.start()
+    time.sleep(1.5)
+    try:
+        s0, s1, counter = asyncio.run(load(n_viewers, seconds))
+    finally:
+        proc.terminate()
+
+    wall = s1["uptime"] - s0["uptime"]
+    cpu = (s1["cpu_time"] - s0["cpu_time"]) / wall
+    print(f"\n🌊 {len(s1['viewers'])} visores, {counter['frames']} cuadros decodificados, "
+          f"CPU servidor {cpu * 100:.0f} % de un núcleo (incluye la fuente sintética)")
+    for ch in s1["channels"]:
+        kbps = [v["kbps"] for v in s1["viewers"] if v["bins"] == ch["bins"] and v["fps"] == ch["fps"]]
+        print(f"   bins={ch['bins']:5d} [{ch['lo']:.2f}, {ch['hi']:.2f}) fps={ch['fps']:4.1f}  "
+              f"visores={ch['viewers']:3d}  {np.mean(kbps):6.1f} kbit/s por visor  "
+              f"{ch['compression']}× vs float32 completo (delta/RLE {ch['delta_rle']}×)")
+    ok &= counter["errors"] == 0 and s1["dropped_slow"] == 0 and len(s1["viewers"]) == n_viewers
+    print("   ✅ todos los visores reciben y decodifican" if ok else "   ❌ problemas con visores o códec")
+
+if __name__ == "__main__":
+    main()
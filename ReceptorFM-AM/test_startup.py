@@ -0,0 +1,97 @@
+import os
+import sys
+import json
+import time
+import subprocess
+
+# ------------------------------------------
+#  BENCHMARK DE ARRANQUE
+# ------------------------------------------
+# Lanza cada receptor en un proceso nuevo con FM_STARTUP_BENCH=1 y mide,
+# desde el lanzamiento, cuándo aparece cada hito ([startup] ...):
+#   GUI: window (ventana pintada), first_audio
+#   CLI (test_audio_fluido_v4): sdr_ready, kernels_ready, first_audio
+# También mide el costo de import de cada módulo pesado en un intérprete limpio.
+#
+# Uso:
+#   python test_startup.py             → mide y compara con startup_baseline.json
+#   python test_startup.py --guardar   → guarda las mediciones como nueva referencia
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "startup_baseline.json")
+TOLERANCE = 1.25          # +25% sobre la referencia = regresión
+
+TARGETS = {
+    "gui": ("fm_receiver_gui.py", ["window", "first_audio"]),
+    "cli_v4": ("test_audio_fluido_v4.py", ["sdr_ready", "kernels_ready", "first_audio"]),
+}
+MODULES = ["numpy", "scipy.signal", "sounddevice", "rtlsdr", "numba", "PyQt5.QtWidgets",
+           "matplotlib.backends.backend_qt5agg"]
+
+
+def run_target(script, labels, timeout=30.0):
+    env = dict(os.environ, FM_STARTUP_BENCH="1", QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    t0 = time.perf_counter()
+    p = subprocess.Popen([sys.executable, script], cwd=HERE, env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    got = {}
+    try:
+        for line in p.stdout:
+            if line.startswith("[startup]"):
+                label = line.split()[1]
+                got[label] = (time.perf_counter() - t0) * 1000
+                if all(l in got for l in labels):
+                    break
+            if time.perf_counter() - t0 > timeout:
+                break
+    finally:
+        p.kill()
+        p.wait()
+    return got
+
+
+def import_cost(module):
+    code = f"import time; t=time.perf_counter(); import {module}; print((time.perf_counter()-t)*1000)"
+    r = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    return float(r.stdout.strip()) if r.returncode == 0 else None
+
+
+def main():
+    results = {}
+
+    print("📦 Costo de import (intérprete limpio):")
+    for m in MODULES:
+        ms = import_cost(m)
+        results[f"import:{m}"] = ms
+        print(f"   {m:40s} {'no instalado' if ms is None else f'{ms:8.1f} ms'}")
+
+    print("\n⏱  Hitos de arranque (desde el lanzamiento del proceso):")
+    for name, (script, labels) in TARGETS.items():
+        got = run_target(script, labels)
+        for l in labels:
+            results[f"{name}:{l}"] = got.get(l)
+            print(f"   {name:8s} {l:15s} {'—' if l not in got else f'{got[l]:8.1f} ms'}")
+
+    if "--guardar" in sys.argv:
+        with open(BASELINE, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Referencia guardada en {BASELINE}")
+        return
+
+    if not os.path.exists(BASELINE):
+        print("\nℹ Sin referencia: ejecuta con --guardar para crearla")
+        return
+
+    with open(BASELINE) as f:
+        base = json.load(f)
+    regressions = [(k, base[k], v) for k, v in results.items()
+                   if v is not None and base.get(k) and v > base[k] * TOLERANCE]
+    if regressions:
+        print("\n❌ Regresiones de arranque:")
+        for k, b, v in regressions:
+            print(f"   {k}: {b:.1f} → {v:.1f} ms")
+        sys.exit(1)
+    print("\n✅ Sin regresiones de arranque")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+# Decodificador ADS-B (Mode S, 1090 MHz) vectorizado
+# Trabaja sobre el stream de magnitud a 2 MS/s (2 muestras por bit de 1 us).
+# - Detección de preámbulos por correlación vectorizada sobre el bloque completo
+# - CRC-24 por tabla, vectorizado sobre todos los candidatos a la vez
+# - Corrección de errores de 1 bit por tabla de síndromes (DF17/18)
+# - Decodificación CPR global (par par/impar) y local (referencia)
+# - Tabla de aeronaves con registros __slots__ y expiración
+
+import time
+import numpy as np
+
+SAMPLE_RATE = 2e6
+PREAMBLE_SAMPLES = 16              # 8 us
+LONG_BITS = 112
+SHORT_BITS = 56
+MSG_SAMPLES = PREAMBLE_SAMPLES + 2 * LONG_BITS
+
+CRC_POLY = 0xFFF409                # polinomio generador Mode S (sin el bit 24)
+CPR_MAX = 131072.0                 # 2^17
+CPR_NZ = 15
+CPR_PAIR_MAX_AGE = 10.0            # segundos entre mensajes par/impar
+
+CALLSIGN_CHARS = "#ABCDEFGHIJKLMNOPQRSTUVWXYZ##### ###############0123456789######"
+
+# -----------------------
+# MAGNITUD
+# -----------------------
+
+# LUT para convertir pares I/Q uint8 crudos (read_bytes) en magnitud sin pasar por complex128
+_iq = (np.arange(256, dtype=np.float32) - 127.5) / 127.5
+_MAG_LUT = np.sqrt(_iq[:, None] ** 2 + _iq[None, :] ** 2).astype(np.float32).ravel()
+
+
+def magnitude_from_bytes(raw):
+    # raw: bytes intercalados I,Q,I,Q... tal como los entrega sdr.read_bytes()
+    u8 = np.frombuffer(raw, dtype=np.uint8)
+    pairs = u8[: len(u8) & ~1].reshape(-1, 2)
+    idx = (pairs[:, 0].astype(np.uint16) << 8) | pairs[:, 1]
+    return _MAG_LUT[idx]
+
+
+def magnitude_from_iq(iq):
+    return np.abs(iq).astype(np.float32)
+
+# -----------------------
+# CRC-24
+# -----------------------
+
+def _build_crc_table():
+    table = np.zeros(256, dtype=np.uint32)
+    for b in range(256):
+        c = b << 16
+        for _ in range(8):
+            c = (c << 1) ^ CRC_POLY if c & 0x800000 else c << 1
+        table[b] = c & 0xFFFFFF
+    return table
+
+
+CRC_TABLE = _build_crc_table()
+
+
+def crc24(data):
+    # data: (n, k) uint8 -> CRC de cada fila, vectorizado sobre n
+    data = np.atleast_2d(data)
+    crc = np.zeros(data.shape[0], dtype=np.uint32)
+    for j in range(data.shape[1]):
+        crc = ((crc << 8) & 0xFFFFFF) ^ CRC_TABLE[((crc >> 16) ^ data[:, j]) & 0xFF]
+    return crc
+
+
+def syndrome(data, nbits):
+    # síndrome = CRC(datos) ^ paridad transmitida; 0 si el mensaje es correcto
+    nbytes = nbits // 8
+    data = np.atleast_2d(data)
+    parity = ((data[:, nbytes - 3].astype(np.uint32) << 16)
+              | (data[:, nbytes - 2].astype(np.uint32) << 8)
+              | data[:, nbytes - 1])
+    return crc24(data[:, :nbytes - 3]) ^ parity
+
+
+def _build_error_table(nbits=LONG_BITS):
+    # el CRC es lineal: el síndrome de un bit erróneo sólo depende de su posición
+    msgs = np.zeros((nbits, nbits // 8), dtype=np.uint8)
+    pos = np.arange(nbits)
+    msgs[pos, pos // 8] = 0x80 >> (pos % 8)
+    syn = syndrome(msgs, nbits)
+    order = np.argsort(syn)
+    return syn[order], pos[order]
+
+
+_ERR_SYN, _ERR_POS = _build_error_table()
+
+
+def fix_single_bit(syn):
+    # devuelve la posición del bit a corregir (-1 si no corresponde a 1 bit)
+    k = np.searchsorted(_ERR_SYN, syn)
+    k = np.minimum(k, len(_ERR_SYN) - 1)
+    return np.where(_ERR_SYN[k] == syn, _ERR_POS[k], -1)
+
+# -----------------------
+# CPR
+# -----------------------
+
+def cpr_nl(lat):
+    lat = abs(lat)
+    if lat == 0:
+        return 59
+    if lat == 87:
+        return 2
+    if lat > 87:
+        return 1
+    a = 1 - np.cos(np.pi / (2 * CPR_NZ))
+    b = np.cos(np.pi / 180.0 * lat) ** 2
+    return int(np.floor(2 * np.pi / np.arccos(1 - a / b)))
+
+
+def cpr_decode_global(even, odd, odd_is_newest):
+    # even/odd: (lat_cpr, lon_cpr) crudos de 17 bits
+    lat0, lon0 = even[0] / CPR_MAX, even[1] / CPR_MAX
+    lat1, lon1 = odd[0] / CPR_MAX, odd[1] / CPR_MAX
+
+    j = np.floor(59 * lat0 - 60 * lat1 + 0.5)
+    rlat0 = 360.0 / 60 * ((j % 60) + lat0)
+    rlat1 = 360.0 / 59 * ((j % 59) + lat1)
+    if rlat0 >= 270:
+        rlat0 -= 360
+    if rlat1 >= 270:
+        rlat1 -= 360
+
+    nl = cpr_nl(rlat0)
+    if nl != cpr_nl(rlat1):
+        return None   # par en distintas zonas de latitud: esperar otro par
+
+    if odd_is_newest:
+        ni = max(nl - 1, 1)
+        m = np.floor(lon0 * (nl - 1) - lon1 * nl + 0.5)
+        lon = 360.0 / ni * ((m % ni) + lon1)
+        lat = rlat1
+    else:
+        ni = max(nl, 1)
+        m = np.floor(lon0 * (nl - 1) - lon1 * nl + 0.5)
+        lon = 360.0 / ni * ((m % ni) + lon0)
+        lat = rlat0
+
+    if lon >= 180:
+        lon -= 360
+    return float(lat), float(lon)
+
+
+def cpr_decode_local(ref_lat, ref_lon, lat_cpr, lon_cpr, odd):
+    i = 1 if odd else 0
+    lat_c, lon_c = lat_cpr / CPR_MAX, lon_cpr / CPR_MAX
+
+    dlat = 360.0 / (60 - i)
+    j = np.floor(ref_lat / dlat) + np.floor(0.5 + (ref_lat % dlat) / dlat - lat_c)
+    lat = dlat * (j + lat_c)
+
+    dlon = 360.0 / max(cpr_nl(lat) - i, 1)
+    m = np.floor(ref_lon / dlon) + np.floor(0.5 + (ref_lon % dlon) / dlon - lon_c)
+    lon = dlon * (m + lon_c)
+    return float(lat), float(lon)
+
+# -----------------------
+# CAMPOS
+# -----------------------
+
+def decode_ac12(ac):
+    # altitud de 12 bits (ES). Sólo codificación con bit Q (25 ft)
+    if ac & 0x10 == 0:
+        return None   # Gillham (100 ft) no soportado
+    n = ((ac & 0xFE0) >> 1) | (ac & 0x0F)
+    return n * 25 - 1000
+
+
+def decode_ac13(ac):
+    # altitud de 13 bits (DF0/4/16/20): bit M en 0x40, bit Q en 0x10
+    if ac & 0x40 or ac & 0x10 == 0:
+        return None
+    n = ((ac & 0x1F80) >> 2) | ((ac & 0x20) >> 1) | (ac & 0x0F)
+    return n * 25 - 1000
+
+
+def decode_squawk(id13):
+    # identidad 4096 (C1 A1 C2 A2 C4 A4 X B1 D1 B2 D2 B4 D4)
+    bits = [(id13 >> (12 - k)) & 1 for k in range(13)]
+    c1, a1, c2, a2, c4, a4, _, b1, d1, b2, d2, b4, d4 = bits
+    a = a4 * 4 + a2 * 2 + a1
+    b = b4 * 4 + b2 * 2 + b1
+    c = c4 * 4 + c2 * 2 + c1
+    d = d4 * 4 + d2 * 2 + d1
+    return f"{a}{b}{c}{d}"
+
+
+def decode_callsign(me):
+    chars = [(me >> (42 - 6 * k)) & 0x3F for k in range(8)]
+    return "".join(CALLSIGN_CHARS[c] for c in chars).replace("#", "").strip()
+
+
+def decode_velocity(me):
+    subtype = (me >> 48) & 0x7
+    if subtype not in (1, 2):
+        return None
+    s_ew = (me >> 42) & 1
+    v_ew = (me >> 32) & 0x3FF
+    s_ns = (me >> 31) & 1
+    v_ns = (me >> 21) & 0x3FF
+    s_vr = (me >> 19) & 1
+    vr = (me >> 10) & 0x1FF
+    if v_ew == 0 or v_ns == 0:
+        return None
+    scale = 4 if subtype == 2 else 1
+    vx = (v_ew - 1) * scale * (-1 if s_ew else 1)
+    vy = (v_ns - 1) * scale * (-1 if s_ns else 1)
+    speed = float(np.hypot(vx, vy))
+    heading = float(np.degrees(np.arctan2(vx, vy)) % 360)
+    vert_rate = None if vr == 0 else (vr - 1) * 64 * (-1 if s_vr else 1)
+    return speed, heading, vert_rate
+
+# -----------------------
+# TABLA DE AERONAVES
+# -----------------------
+
+class Aircraft:
+    __slots__ = ("icao", "callsign", "altitude", "lat", "lon", "speed", "heading",
+                 "vert_rate", "squawk", "first_seen", "last_seen", "messages",
+                 "even_cpr", "odd_cpr", "last_pos_time")
+
+    def __init__(self, icao, now):
+        self.icao = icao
+        self.callsign = None
+        self.altitude = None
+        self.lat = None
+        self.lon = None
+        self.speed = None
+        self.heading = None
+        self.vert_rate = None
+        self.squawk = None
+        self.first_seen = now
+        self.last_seen = now
+        self.messages = 0
+        self.even_cpr = None      # (lat_cpr, lon_cpr, t)
+        self.odd_cpr = None
+        self.last_pos_time = None
+
+    def __repr__(self):
+        pos = f"{self.lat:.4f},{self.lon:.4f}" if self.lat is not None else "-"
+        spd = f"{self.speed:.0f}" if self.speed is not None else "-"
+        hdg = f"{self.heading:.0f}" if self.heading is not None else "-"
+        return (f"Aircraft({self.icao:06X} {self.callsign or '-'} alt={self.altitude} "
+                f"pos={pos} spd={spd} hdg={hdg} msgs={self.messages})")
+
+
+class AircraftTable:
+    def __init__(self, ttl=60.0):
+        self.ttl = ttl
+        self._aircraft = {}
+
+    def get(self, icao, now, create=True):
+        ac = self._aircraft.get(icao)
+        if ac is None and create:
+            ac = self._aircraft[icao] = Aircraft(icao, now)
+        return ac
+
+    def __contains__(self, icao):
+        return icao in self._aircraft
+
+    def __len__(self):
+        return len(self._aircraft)
+
+    def __iter__(self):
+        return iter(self._aircraft.values())
+
+    def known_addresses(self):
+        return np.fromiter(self._aircraft.keys(), dtype=np.uint32, count=len(self._aircraft))
+
+    def evict(self, now):
+        old = [k for k, ac in self._aircraft.items() if now - ac.last_seen > self.ttl]
+        for k in old:
+            del self._aircraft[k]
+        return len(old)
+
+# -----------------------
+# DECODIFICADOR
+# -----------------------
+
+class AdsbDecoder:
+    def __init__(self, snr_ratio=2.0, fix_errors=True, ttl=60.0, ref_position=None):
+        self.snr_ratio = snr_ratio
+        self.fix_errors = fix_errors
+        self.ref_position = ref_position    # (lat, lon) del receptor, opcional
+        self.aircraft = AircraftTable(ttl)
+        self._tail = np.zeros(0, dtype=np.float32)
+
+        self.stats = {"preambles": 0, "crc_ok": 0, "corrected": 0, "messages": 0}
+
+    # --- detección ---
+    def detect_preambles(self, m, limit):
+        s = [m[k:k + limit] for k in range(15)]
+        high = s[0] + s[2] + s[7] + s[9]
+        low = s[1] + s[3] + s[4] + s[5] + s[6] + s[8]
+        shape = ((s[0] > s[1]) & (s[1] < s[2]) & (s[2] > s[3]) & (s[3] < s[0])
+                 & (s[4] < s[0]) & (s[5] < s[0]) & (s[6] < s[0])
+                 & (s[7] > s[8]) & (s[8] < s[9]) & (s[9] > s[6]))
+        # relación señal/ruido: media de pulsos vs media de huecos
+        snr = high * 6 > self.snr_ratio * 4 * low
+        quiet = (s[11] + s[12] + s[13] + s[14]) < high * 0.5
+        return np.flatnonzero(shape & snr & quiet)
+
+    def extract_bits(self, m, cand):
+        idx = cand[:, None] + PREAMBLE_SAMPLES + 2 * np.arange(LONG_BITS)[None, :]
+        bits = m[idx] > m[idx + 1]
+        return np.packbits(bits, axis=1)
+
+    # --- validación ---
+    def validate(self, data):
+        df = data[:, 0] >> 3
+        is_long = df >= 16
+        syn = np.where(is_long, syndrome(data, LONG_BITS), syndrome(data, SHORT_BITS))
+
+        ok = np.zeros(len(data), dtype=bool)
+        es = (df == 17) | (df == 18)
+        ok |= es & (syn == 0)
+
+        if self.fix_errors:
+            pos = fix_single_bit(syn)
+            # no se corrigen bits del campo DF (primeros 5 bits)
+            fixable = es & (syn != 0) & (pos >= 5)
+            rows = np.flatnonzero(fixable)
+            if len(rows):
+                p = pos[rows]
+                data[rows, p // 8] ^= (0x80 >> (p % 8)).astype(np.uint8)
+                ok[rows] = True
+                self.stats["corrected"] += len(rows)
+
+        # DF11: paridad con II (síndrome < 0x80)
+        ok |= (df == 11) & ((syn & ~np.uint32(0x7F)) == 0)
+
+        # DF0/4/5/16/20/21: dirección/paridad, aceptar sólo aeronaves conocidas
+        ap = (df == 0) | (df == 4) | (df == 5) | (df == 16) | (df == 20) | (df == 21)
+        if ap.any() and len(self.aircraft):
+            ok |= ap & np.isin(syn, self.aircraft.known_addresses())
+
+        return ok, syn, is_long
+
+    # --- proceso de un bloque ---
+    def process(self, mag, now=None):
+        if now is None:
+            now = time.time()
+
+        m = np.concatenate((self._tail, np.asarray(mag, dtype=np.float32)))
+        limit = len(m) - MSG_SAMPLES
+        if limit <= 0:
+            self._tail = m
+            return []
+        # la cola conserva las muestras aún no exploradas como inicio de preámbulo
+        self._tail = m[limit:]
+
+        cand = self.detect_preambles(m, limit)
+        self.stats["preambles"] += len(cand)
+        if len(cand) == 0:
+            return []
+
+        data = self.extract_bits(m, cand)
+        ok, syn, is_long = self.validate(data)
+        self.stats["crc_ok"] += int(ok.sum())
+
+        out = []
+        next_free = -1
+        for k in np.flatnonzero(ok):
+            start = cand[k]
+            if start < next_free:
+                continue   # solapado con un mensaje ya aceptado
+            nbits = LONG_BITS if is_long[k] else SHORT_BITS
+            next_free = start + PREAMBLE_SAMPLES + 2 * nbits
+            msg = self.decode_message(data[k, :nbits // 8].tobytes(), int(syn[k]), now)
+            if msg is not None:
+                out.append(msg)
+
+        self.stats["messages"] += len(out)
+        return out
+
+    # --- decodificación de campos ---
+    def decode_message(self, raw, syn, now):
+        df = raw[0] >> 3
+        bits = int.from_bytes(raw, "big")
+        nbits = len(raw) * 8
+        msg = {"df": df, "raw": raw.hex()}
+
+        if df in (17, 18):
+            icao = (bits >> 80) & 0xFFFFFF
+        elif df == 11:
+            icao = (bits >> 24) & 0xFFFFFF
+        else:
+            icao = syn   # dirección recuperada de la paridad
+        msg["icao"] = icao
+
+        ac = self.aircraft.get(icao, now)
+        ac.last_seen = now
+        ac.messages += 1
+
+        if df in (0, 4, 16, 20):
+            alt = decode_ac13((bits >> (nbits - 32)) & 0x1FFF)
+            if alt is not None:
+                ac.altitude = msg["altitude"] = alt
+        elif df in (5, 21):
+            ac.squawk = msg["squawk"] = decode_squawk((bits >> (nbits - 32)) & 0x1FFF)
+        elif df in (17, 18):
+            self._decode_es(ac, (bits >> 24) & ((1 << 56) - 1), msg, now)
+        return msg
+
+    def _decode_es(self, ac, me, msg, now):
+        tc = me >> 51
+        msg["tc"] = tc
+
+        if 1 <= tc <= 4:
+            ac.callsign = msg["callsign"] = decode_callsign(me)
+
+        elif 9 <= tc <= 18 or 20 <= tc <= 22:
+            alt = decode_ac12((me >> 36) & 0xFFF)
+            if alt is not None and tc <= 18:
+                ac.altitude = msg["altitude"] = alt
+            odd = (me >> 34) & 1
+            lat_cpr = (me >> 17) & 0x1FFFF
+            lon_cpr = me & 0x1FFFF
+            pos = self._update_position(ac, odd, lat_cpr, lon_cpr, now)
+            if pos is not None:
+                msg["lat"], msg["lon"] = pos
+
+        elif tc == 19:
+            vel = decode_velocity(me)
+            if vel is not None:
+                ac.speed, ac.heading, ac.vert_rate = vel
+                msg["speed"], msg["heading"], msg["vert_rate"] = vel
+
+    def _update_position(self, ac, odd, lat_cpr, lon_cpr, now):
+        if odd:
+            ac.odd_cpr = (lat_cpr, lon_cpr, now)
+        else:
+            ac.even_cpr = (lat_cpr, lon_cpr, now)
+
+        pos = None
+        # local: respecto a la última posición reciente de esta aeronave
+        if ac.lat is not None and now - ac.last_pos_time < CPR_PAIR_MAX_AGE:
+            pos = cpr_decode_local(ac.lat, ac.lon, lat_cpr, lon_cpr, odd)
+        elif ac.even_cpr and ac.odd_cpr and abs(ac.even_cpr[2] - ac.odd_cpr[2]) <= CPR_PAIR_MAX_AGE:
+            pos = cpr_decode_global(ac.even_cpr, ac.odd_cpr, odd_is_newest=bool(odd))
+        elif self.ref_position is not None:
+            pos = cpr_decode_local(self.ref_position[0], self.ref_position[1], lat_cpr, lon_cpr, odd)
+
+        if pos is not None:
+            ac.lat, ac.lon = pos
+            ac.last_pos_time = now
+        return pos
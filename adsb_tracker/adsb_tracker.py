@@ -0,0 +1,58 @@
+import time
+import warnings
+warnings.filterwarnings("ignore", category=UserWarning)
+
+from rtlsdr import RtlSdr
+
+from adsb_decoder import AdsbDecoder, SAMPLE_RATE, magnitude_from_bytes
+
+# -----------------------
+# TRACKER ADS-B EN TIEMPO REAL
+# -----------------------
+
+def print_table(decoder):
+    print("\n ICAO   Callsign   Alt(ft)  Vel(kt)  Rumbo   Lat       Lon       Msgs")
+    for ac in sorted(decoder.aircraft, key=lambda a: a.icao):
+        lat = f"{ac.lat:8.4f}" if ac.lat is not None else "    -   "
+        lon = f"{ac.lon:9.4f}" if ac.lon is not None else "    -    "
+        print(f" {ac.icao:06X} {ac.callsign or '-':<10} {ac.altitude or '-':>7}  "
+              f"{ac.speed or 0:7.0f}  {ac.heading or 0:5.0f}  {lat} {lon} {ac.messages:5d}")
+    s = decoder.stats
+    print(f" preámbulos={s['preambles']} crc_ok={s['crc_ok']} corregidos={s['corrected']} mensajes={s['messages']}")
+
+
+def main():
+    sdr = RtlSdr()
+    sdr.sample_rate = SAMPLE_RATE
+    sdr.center_freq = 1090e6
+    sdr.gain = 49.6
+
+    BLOCK = 256 * 1024          # muestras I/Q por lectura (~131 ms)
+
+    decoder = AdsbDecoder(ref_position=None)   # (lat, lon) del receptor si se conoce
+
+    print("✈️  Escuchando ADS-B en 1090 MHz... CTRL+C para detener.")
+
+    last_print = time.time()
+    try:
+        while True:
+            # bytes crudos: evita la conversión a complex128 de read_samples
+            raw = sdr.read_bytes(2 * BLOCK)
+            now = time.time()
+            mag = magnitude_from_bytes(raw)
+
+            for msg in decoder.process(mag, now):
+                if "callsign" in msg or "lat" in msg:
+                    print(f"  {msg['icao']:06X} DF{msg['df']} {msg}")
+
+            if now - last_print > 5:
+                decoder.aircraft.evict(now)
+                print_table(decoder)
+                last_print = now
+    except KeyboardInterrupt:
+        pass
+
+    sdr.close()
+
+if __name__ == "__main__":
+    main()
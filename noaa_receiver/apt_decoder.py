@@ -0,0 +1,185 @@
+# Decodificador APT (NOAA) en streaming
+# Cadena: IQ (1.04 MS/s) → canal + decimación (41.6 kHz) → fm_demod
+#         → decimación (20.8 kHz) → demod AM de la subportadora de 2400 Hz
+#         → píxeles (4160 px/s) → sincronismo por correlación FFT → imagen
+# Todas las etapas guardan estado entre bloques, así que el tamaño de bloque
+# no afecta el resultado y la memoria queda acotada durante todo el pase.
+
+import os
+import sys
+import numpy as np
+import scipy.signal as sig
+from numpy.lib.stride_tricks import sliding_window_view
+
+# el demodulador FM es el de ReceptorFM-AM: una sola implementación para todos
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ReceptorFM-AM"))
+from fm_discriminators import fm_demod_exact as fm_demod
+
+SAMPLE_RATE = 1.04e6
+IF_RATE = 41600               # 1.04 MHz / 25
+AUDIO_RATE = 20800            # 41.6 kHz / 2
+PIXEL_RATE = 4160             # 20.8 kHz / 5
+SUBCARRIER = 2400
+
+LINE_PX = 2080                # 2 líneas por segundo
+PASS_LINES = 1800             # 15 minutos
+
+# Sync A: 4 px bajos + 7 ciclos de 1040 Hz (2 px arriba, 2 abajo) + 7 px bajos
+SYNC_A = np.array([0] * 4 + [1, 1, 0, 0] * 7 + [0] * 7, dtype=np.float32)
+
+# -----------------------
+# DECIMADOR FIR CON ESTADO
+# -----------------------
+
+class StreamingDecimator:
+    # FIR polifásico: sólo se calculan las salidas que sobreviven a la decimación
+    def __init__(self, taps, down, dtype=np.complex64):
+        self.h = np.asarray(taps[::-1], dtype=np.float32)
+        self.down = down
+        self._tail = np.zeros(len(taps) - 1, dtype=dtype)
+
+    def process(self, x):
+        buf = np.concatenate((self._tail, x))
+        ntaps = len(self.h)
+        if len(buf) < ntaps:
+            self._tail = buf
+            return buf[:0]
+        n_out = (len(buf) - ntaps) // self.down + 1
+        win = sliding_window_view(buf, ntaps)[::self.down][:n_out]
+        y = win @ self.h
+        self._tail = buf[n_out * self.down:]
+        return y
+
+# -----------------------
+# DECODIFICADOR APT
+# -----------------------
+
+class AptDecoder:
+    def __init__(self, max_lines=PASS_LINES + 60):
+        self.chan = StreamingDecimator(sig.firwin(101, 20e3, fs=SAMPLE_RATE), 25, np.complex64)
+        self.audio = StreamingDecimator(sig.firwin(31, 9e3, fs=IF_RATE), 2, np.float32)
+        self.am = StreamingDecimator(sig.firwin(41, 1.8e3, fs=AUDIO_RATE), 5, np.complex64)
+
+        self._last_iq = np.zeros(1, dtype=np.complex64)
+        self._sub_phase = 0.0
+
+        # píxeles pendientes de asignar a una línea (nunca más de ~2 líneas)
+        self._px = np.zeros(0, dtype=np.float32)
+        self._template = (SYNC_A - SYNC_A.mean())[::-1].copy()
+        self._locked = False
+
+        # imagen preasignada para el pase completo
+        self.image = np.zeros((max_lines, LINE_PX), dtype=np.uint8)
+        self.lines = 0
+        self._lo = None
+        self._hi = None
+
+        self.stats = {"samples": 0, "pixels": 0, "resyncs": 0, "dropped_lines": 0}
+
+    # --- etapas de señal ---
+    def demodulate(self, iq):
+        iq = np.asarray(iq, dtype=np.complex64)
+        self.stats["samples"] += len(iq)
+
+        chan = self.chan.process(iq)
+        if len(chan) == 0:
+            return np.zeros(0, dtype=np.float32)
+        demod = fm_demod(np.concatenate((self._last_iq, chan))).astype(np.float32)
+        self._last_iq = chan[-1:]
+
+        audio = self.audio.process(demod)
+
+        # bajar la subportadora de 2400 Hz a banda base con fase continua
+        n = np.arange(len(audio))
+        w = 2 * np.pi * SUBCARRIER / AUDIO_RATE
+        mixed = audio * np.exp(-1j * (self._sub_phase + w * n)).astype(np.complex64)
+        self._sub_phase = (self._sub_phase + w * len(audio)) % (2 * np.pi)
+
+        return np.abs(self.am.process(mixed)).astype(np.float32)
+
+    # --- sincronismo ---
+    def find_lines(self):
+        px = self._px
+        if len(px) < LINE_PX + len(SYNC_A):
+            return
+
+        # correlación cruzada con el patrón Sync A para todo el bloque pendiente
+        corr = sig.fftconvolve(px - px.mean(), self._template, mode="valid")
+
+        pos = 0
+        while pos + LINE_PX + len(SYNC_A) <= len(px):
+            if self._locked:
+                # seguimiento: buscar cerca de la posición esperada
+                lo, hi = max(pos - 8, 0), min(pos + 9, len(corr))
+            else:
+                lo, hi = pos, min(pos + LINE_PX, len(corr))
+            start = lo + int(np.argmax(corr[lo:hi]))
+
+            # enganche: el pico debe destacar claramente sobre la correlación de la línea
+            ref = corr[pos:min(pos + LINE_PX, len(corr))]
+            strong = corr[start] - ref.mean() > 6 * ref.std()
+            if self._locked and not strong:
+                self.stats["resyncs"] += 1
+            self._locked = strong
+
+            if start + LINE_PX > len(px):
+                if strong:
+                    pos = start   # descartar lo anterior al sincronismo
+                break
+            self._emit_line(px[start:start + LINE_PX])
+            pos = start + LINE_PX
+
+        self._px = px[pos:]
+
+    def _emit_line(self, line):
+        if self.lines >= len(self.image):
+            self.stats["dropped_lines"] += 1
+            return
+        # niveles de negro/blanco suavizados entre líneas
+        lo, hi = np.percentile(line, [1, 99])
+        if self._lo is None:
+            self._lo, self._hi = lo, hi
+        else:
+            self._lo += 0.05 * (lo - self._lo)
+            self._hi += 0.05 * (hi - self._hi)
+        scale = 255.0 / max(self._hi - self._lo, 1e-9)
+        self.image[self.lines] = np.clip((line - self._lo) * scale, 0, 255)
+        self.lines += 1
+
+    # --- API ---
+    def process(self, iq):
+        px = self.demodulate(iq)
+        self.stats["pixels"] += len(px)
+        self._px = np.concatenate((self._px, px))
+        before = self.lines
+        self.find_lines()
+        return self.lines - before
+
+    def get_image(self):
+        return self.image[:self.lines]
+
+# -----------------------
+# ARCHIVOS IQ
+# -----------------------
+
+def read_iq_file(path, block=1 << 20):
+    # .cu8 / .bin: bytes I/Q de rtl_sdr; cualquier otro: complex64 (.cf32)
+    raw = path.lower().endswith((".cu8", ".bin"))
+    dtype = np.uint8 if raw else np.complex64
+    count = 2 * block if raw else block
+    with open(path, "rb") as f:
+        while True:
+            data = np.fromfile(f, dtype=dtype, count=count)
+            if len(data) == 0:
+                break
+            if raw:
+                data = data[: len(data) & ~1].astype(np.float32).view(np.complex64)
+                data = (data - (127.5 + 127.5j)) / 127.5
+            yield data
+
+
+def decode_file(path, block=1 << 20):
+    dec = AptDecoder()
+    for iq in read_iq_file(path, block):
+        dec.process(iq)
+    return dec
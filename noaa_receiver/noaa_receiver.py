@@ -0,0 +1,73 @@
+import sys
+import time
+import warnings
+warnings.filterwarnings("ignore", category=UserWarning)
+
+import matplotlib.pyplot as plt
+
+from apt_decoder import AptDecoder, SAMPLE_RATE, PASS_LINES, decode_file
+
+# ------------------------------------------
+#  RECEPTOR NOAA APT
+# ------------------------------------------
+# Uso:
+#   python noaa_receiver.py                    → captura en vivo con el RTL-SDR
+#   python noaa_receiver.py pase.cu8|pase.cf32 → decodifica una grabación IQ a 1.04 MS/s
+
+NOAA_15 = 137.620e6
+NOAA_18 = 137.9125e6
+NOAA_19 = 137.100e6
+
+
+def save_image(dec, path="noaa_apt.png"):
+    img = dec.get_image()
+    if len(img) == 0:
+        print("⚠ No se decodificaron líneas")
+        return
+    plt.imsave(path, img, cmap="gray", vmin=0, vmax=255)
+    print(f"💾 Imagen guardada: {path} ({img.shape[0]} líneas)")
+
+
+def decode_recording(path):
+    print(f"📂 Decodificando {path}...")
+    t0 = time.time()
+    dec = decode_file(path)
+    elapsed = time.time() - t0
+    seconds = dec.stats["samples"] / SAMPLE_RATE
+    print(f"✔ {seconds:.0f} s de señal en {elapsed:.1f} s ({seconds / max(elapsed, 1e-9):.1f}x tiempo real)")
+    save_image(dec)
+
+
+def receive_live(freq=NOAA_19):
+    from rtlsdr import RtlSdr
+
+    sdr = RtlSdr()
+    sdr.sample_rate = SAMPLE_RATE
+    sdr.center_freq = freq
+    sdr.gain = 40
+
+    BLOCK = 256 * 1024
+    dec = AptDecoder()
+
+    print(f"🛰  Recibiendo APT en {freq/1e6:.4f} MHz... CTRL+C para terminar el pase.")
+    try:
+        while dec.lines < PASS_LINES:
+            samples = sdr.read_samples(BLOCK)
+            if dec.process(samples):
+                print(f"\r   líneas: {dec.lines}", end="")
+    except KeyboardInterrupt:
+        pass
+    print()
+
+    sdr.close()
+    save_image(dec)
+
+
+def main():
+    if len(sys.argv) > 1:
+        decode_recording(sys.argv[1])
+    else:
+        receive_live()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import sys
+import time
+import numpy as np
+
+from apt_decoder import (
+    AptDecoder, SAMPLE_RATE, PIXEL_RATE, SUBCARRIER, LINE_PX, SYNC_A
+)
+
+# ------------------------------------------
+#  GENERADOR SINTÉTICO APT
+# ------------------------------------------
+
+SYNC_B = np.array([0] * 4 + [1, 1, 1, 0, 0] * 7, dtype=np.float32)
+IMAGE_PX = 909
+DEVIATION = 17e3
+
+
+def build_line(n, rng):
+    # formato APT: sync A, espacio A, imagen A, telemetría A, sync B, espacio B, imagen B, telemetría B
+    x = np.linspace(0, 1, IMAGE_PX, dtype=np.float32)
+    img_a = 0.5 + 0.4 * np.sin(2 * np.pi * (3 * x + n / 200.0))
+    img_b = np.clip(x + 0.1 * rng.standard_normal(IMAGE_PX), 0, 1).astype(np.float32)
+    tele = np.full(45, ((n // 8) % 8) / 8.0, dtype=np.float32)
+    line = np.concatenate((SYNC_A, np.zeros(47), img_a, tele,
+                           SYNC_B, np.ones(47), img_b, tele)).astype(np.float32)
+    assert len(line) == LINE_PX
+    return line
+
+
+class AptSource:
+    # IQ sintético a 1.04 MS/s generado por bloques, con fase continua
+    def __init__(self, seconds, snr_db=20, offset=0, seed=3):
+        self.rng = np.random.default_rng(seed)
+        self.total = int(seconds * SAMPLE_RATE)
+        self.spp = int(SAMPLE_RATE / PIXEL_RATE)   # 250 muestras por píxel
+        self.noise = 10 ** (-snr_db / 20)
+        self.n = 0
+        self.fm_phase = 0.0
+        self.lines = []
+        # arrancar a mitad de línea para ejercitar la búsqueda del sincronismo
+        self._px = build_line(0, self.rng)[offset:]
+        self._line_no = 1
+
+    def _pixels(self, count):
+        while len(self._px) < count:
+            line = build_line(self._line_no, self.rng)
+            self.lines.append(line)
+            self._px = np.concatenate((self._px, line))
+            self._line_no += 1
+        out, self._px = self._px[:count], self._px[count:]
+        return out
+
+    def blocks(self, block):
+        while self.n < self.total:
+            m = min(block, self.total - self.n)
+            m -= m % self.spp
+            if m == 0:
+                break
+            px = np.repeat(self._pixels(m // self.spp), self.spp)
+            t = (self.n + np.arange(m)) / SAMPLE_RATE
+            audio = (0.1 + 0.8 * px) * np.cos(2 * np.pi * SUBCARRIER * t)
+            phase = self.fm_phase + np.cumsum(2 * np.pi * DEVIATION / SAMPLE_RATE * audio)
+            self.fm_phase = phase[-1] % (2 * np.pi)
+            iq = np.exp(1j * phase).astype(np.complex64)
+            iq += (self.noise * (self.rng.standard_normal(m)
+                                 + 1j * self.rng.standard_normal(m))).astype(np.complex64)
+            self.n += m
+            yield iq
+
+
+# ------------------------------------------
+#  VERIFICACIÓN
+# ------------------------------------------
+
+def main():
+    # uso: python test_apt_sintetico.py [segundos]   (900 = pase completo de 15 min)
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    BLOCK = 256 * 1024
+
+    print(f"🛰  Decodificando {seconds:.0f} s de APT sintético...")
+    src = AptSource(seconds, offset=700)
+    dec = AptDecoder()
+
+    gen_time = 0.0
+    dec_time = 0.0
+    it = src.blocks(BLOCK)
+    while True:
+        t0 = time.perf_counter()
+        iq = next(it, None)
+        t1 = time.perf_counter()
+        if iq is None:
+            break
+        dec.process(iq)
+        t2 = time.perf_counter()
+        gen_time += t1 - t0
+        dec_time += t2 - t1
+
+    img = dec.get_image()
+    print(f"✔ {dec.lines} líneas decodificadas (esperadas ~{int(seconds * 2) - 1}), "
+          f"resyncs={dec.stats['resyncs']}")
+    print(f"⏱  decodificación {dec_time:.2f} s → {seconds / dec_time:.1f}x tiempo real "
+          f"(generación {gen_time:.2f} s)")
+    print(f"💾 imagen {img.shape}, {dec.image.nbytes / 1e6:.1f} MB preasignados")
+
+    # alineación: el sincronismo debe quedar al inicio de cada línea
+    template = SYNC_A - SYNC_A.mean()
+    aligned = [np.dot(row[:len(SYNC_A)].astype(np.float32) - row[:len(SYNC_A)].mean(), template) > 0
+               for row in img[2:]]
+    ok = len(img) >= int(seconds * 2) - 3 and np.mean(aligned) > 0.98
+    # la imagen B es una rampa: su media debe crecer de izquierda a derecha
+    ramp = img[2:, 1126:2035].astype(np.float32).mean(axis=0)
+    ok &= np.corrcoef(ramp, np.arange(len(ramp)))[0, 1] > 0.95
+    ok &= dec_time < seconds
+
+    print("\n✅ Verificación correcta" if ok else "\n❌ Verificación fallida")
+
+if __name__ == "__main__":
+    main()